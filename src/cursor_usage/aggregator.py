@@ -4,32 +4,33 @@ Provides functions to group events by month and compute
 aggregated statistics.
 """
 
-from collections import defaultdict
+from collections.abc import Iterable
 
 from cursor_usage.models import AggregatedStats, UsageEvent
 
 
-def aggregate_by_month(events: list[UsageEvent]) -> list[AggregatedStats]:
+def aggregate_by_month(events: Iterable[UsageEvent]) -> list[AggregatedStats]:
     """Aggregate usage events by month.
 
     Groups events by their YYYY-MM month key and computes
-    totals for each group.
+    totals for each group. Events are consumed in a single pass,
+    so a streaming parser can be passed in without materializing
+    the full event list.
 
     Args:
-        events: List of usage events to aggregate.
+        events: Iterable of usage events to aggregate.
 
     Returns:
         List of AggregatedStats sorted by month (ascending).
     """
-    by_month: dict[str, AggregatedStats] = defaultdict(
-        lambda: AggregatedStats(month="")
-    )
+    by_month: dict[str, AggregatedStats] = {}
 
     for event in events:
         month_key = event.month_key
-        if by_month[month_key].month == "":
-            by_month[month_key].month = month_key
-        by_month[month_key].add(event)
+        stats = by_month.get(month_key)
+        if stats is None:
+            stats = by_month[month_key] = AggregatedStats(month=month_key)
+        stats.add(event)
 
     return sorted(by_month.values(), key=lambda s: s.month)
 
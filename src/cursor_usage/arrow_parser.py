@@ -0,0 +1,106 @@
+"""Vectorized CSV aggregation backed by pyarrow.
+
+Used for large exports when the optional pyarrow dependency is
+installed. CSV parsing, month extraction and the group-by (including
+exact decimal cost sums) all run in Arrow's native kernels; Python only
+touches one row per (month, model, user) group.
+"""
+
+import csv
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
+
+from cursor_usage.models import AggregatedStats, normalize_model, to_cost_units
+from cursor_usage.parser import column_indices
+
+# Token columns summed per group, keyed by CSV column name
+_TOKEN_COLUMNS: tuple[str, ...] = (
+    "Input (w/ Cache Write)",
+    "Input (w/o Cache Write)",
+    "Cache Read",
+    "Output Tokens",
+    "Total Tokens",
+)
+
+# Wide enough for any realistic cost, with one fractional digit per
+# power of ten in COST_SCALE; more fractional digits fail the parse and
+# the caller falls back to the row-by-row parser.
+_COST_TYPE = pa.decimal128(28, 10)
+
+# Dates must start with a YYYY-MM month key, as in parser._parse_month_key()
+_MONTH_PREFIX = r"^\d{4}-(0[1-9]|1[0-2])"
+
+
+def aggregate_csv_file_arrow(file_path: Path) -> list[AggregatedStats]:
+    """Aggregate a CSV file by month using pyarrow.
+
+    Produces the same result as parser.aggregate_csv_stream() for
+    well-formed input.
+
+    Args:
+        file_path: Path to the CSV file.
+
+    Returns:
+        List of AggregatedStats sorted by month (ascending).
+
+    Raises:
+        ValueError: If any row is malformed. Per-row warnings are only
+            available from the row-by-row parser.
+        KeyError: If any of parser.CSV_COLUMNS is missing, including
+            the columns this function does not read.
+    """
+    # Only some columns are read below, so check the header like the
+    # row-by-row parser does. pyarrow drops a UTF-8 BOM, as utf-8-sig does.
+    with file_path.open(mode="r", encoding="utf-8-sig") as f:
+        column_indices(next(csv.reader(f), ()))
+
+    table = pa_csv.read_csv(
+        file_path,
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=["Date", "User", "Model", *_TOKEN_COLUMNS, "Cost"],
+            column_types={
+                "Date": pa.string(),
+                "User": pa.string(),
+                "Model": pa.string(),
+                **dict.fromkeys(_TOKEN_COLUMNS, pa.int64()),
+                "Cost": _COST_TYPE,
+            },
+        ),
+    )
+
+    if any(table[name].null_count for name in (*_TOKEN_COLUMNS, "Cost")):
+        raise ValueError("CSV contains empty numeric fields")
+    if not pc.all(pc.match_substring_regex(table["Date"], _MONTH_PREFIX)).as_py():
+        raise ValueError("CSV contains dates not starting with YYYY-MM")
+
+    table = table.append_column("month", pc.utf8_slice_codeunits(table["Date"], 0, 7))
+
+    # Single-threaded grouping keeps groups in order of first appearance,
+    # so per-model and per-user stats are inserted in the same order as
+    # by the row-by-row parser; the renderer's stable sort keeps that
+    # order for ties.
+    grouped = table.group_by(["month", "Model", "User"], use_threads=False).aggregate(
+        [(name, "sum") for name in (*_TOKEN_COLUMNS, "Cost")]
+    )
+
+    by_month: dict[str, AggregatedStats] = {}
+    for group in grouped.to_pylist():
+        month_key = group["month"]
+        stats = by_month.get(month_key)
+        if stats is None:
+            stats = by_month[month_key] = AggregatedStats(month=month_key)
+        stats.add_usage(
+            group["User"],
+            normalize_model(group["Model"]),
+            input_tokens=group["Input (w/o Cache Write)_sum"],
+            output_tokens=group["Output Tokens_sum"],
+            cache_create=group["Input (w/ Cache Write)_sum"],
+            cache_read=group["Cache Read_sum"],
+            total_tokens=group["Total Tokens_sum"],
+            cost=to_cost_units(group["Cost_sum"]),
+        )
+
+    return sorted(by_month.values(), key=lambda s: s.month)
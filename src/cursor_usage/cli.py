@@ -8,8 +8,8 @@ from typing import Annotated
 
 import typer
 
-from cursor_usage.aggregator import aggregate_by_month, compute_grand_total
-from cursor_usage.parser import parse_csv_file
+from cursor_usage.aggregator import compute_grand_total
+from cursor_usage.parser import aggregate_csv_file
 from cursor_usage.renderer import render_table
 
 app = typer.Typer(
@@ -82,13 +82,12 @@ def analyze(
             "The -a/--anonymize flag requires -g/--group-by-user flag."
         )
 
-    events = parse_csv_file(csv_file)
+    monthly_stats = aggregate_csv_file(csv_file)
 
-    if not events:
+    if not monthly_stats:
         typer.echo("No valid usage events found in the CSV file.", err=True)
         raise typer.Exit(code=1)
 
-    monthly_stats = aggregate_by_month(events)
     total = compute_grand_total(monthly_stats)
 
     table = render_table(
@@ -1,6 +1,9 @@
 """Number and currency formatting utilities."""
 
-from decimal import Decimal
+from cursor_usage.models import COST_SCALE
+
+# Cost units per cent
+_UNITS_PER_CENT = COST_SCALE // 100
 
 
 def format_number(value: int) -> str:
@@ -15,13 +18,22 @@ def format_number(value: int) -> str:
     return f"{value:,}"
 
 
-def format_currency(value: Decimal) -> str:
-    """Format a decimal as USD currency.
+def format_currency(value: int) -> str:
+    """Format an amount in cost units as USD currency.
+
+    Rounds half to even to whole cents, matching Decimal formatting.
 
     Args:
-        value: Decimal value to format.
+        value: Amount in units of 1/COST_SCALE USD.
 
     Returns:
         Formatted string like "$1,234.56".
     """
-    return f"${value:,.2f}"
+    cents, remainder = divmod(abs(value), _UNITS_PER_CENT)
+    if remainder * 2 > _UNITS_PER_CENT or (
+        remainder * 2 == _UNITS_PER_CENT and cents % 2
+    ):
+        cents += 1
+    dollars, cents = divmod(cents, 100)
+    sign = "-" if value < 0 else ""
+    return f"${sign}{dollars:,}.{cents:02d}"
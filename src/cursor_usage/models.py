@@ -1,86 +1,130 @@
 """Data models for cursor usage analysis.
 
-This module defines the Pydantic models used for parsing CSV data
+This module defines the dataclasses used for parsing CSV data
 and representing aggregated statistics.
 """
 
-from datetime import datetime
-from decimal import Decimal
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_EVEN, Decimal
+from functools import lru_cache
 from typing import Self
 
-from pydantic import BaseModel, Field
+# Costs are tracked as integer units of 1/COST_SCALE USD so that
+# accumulation is plain int addition instead of Decimal arithmetic.
+# Costs with up to ten decimal places convert exactly.
+COST_SCALE = 10**10
 
+# Substring -> display name, checked in order against the lowercased model
+_MODEL_FAMILIES: tuple[tuple[str, str], ...] = (
+    ("haiku", "haiku-4-5"),
+    ("opus", "opus-4-5"),
+    ("sonnet", "sonnet-4-5"),
+)
 
-class UsageEvent(BaseModel):
+# Exact (lowercased) model name -> display name
+_MODEL_ALIASES: dict[str, str] = {
+    # Normalize gpt-5.2 to gpt-5-2 for consistency
+    "gpt-5.2": "gpt-5-2",
+}
+
+
+def to_cost_units(value: Decimal) -> int:
+    """Convert a USD amount to integer cost units.
+
+    Amounts finer than 1/COST_SCALE USD, such as float-formatted
+    exports like 0.030000000000000002, are rounded half to even. That
+    is off by at most half a unit per row, far below a cent.
+
+    Args:
+        value: Amount in USD.
+
+    Returns:
+        Amount in units of 1/COST_SCALE USD.
+
+    Raises:
+        ValueError: If the amount is NaN or infinite.
+    """
+    if not value.is_finite():
+        raise ValueError(f"Invalid cost: {value}")
+    return int((value * COST_SCALE).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+@lru_cache(maxsize=256)
+def normalize_model(model: str) -> str:
+    """Return simplified model name for display.
+
+    Transforms verbose model names to concise display names:
+    - claude-4.5-haiku* -> haiku-4-5
+    - claude-4.5-sonnet* -> sonnet-4-5
+    - claude-4.5-opus* -> opus-4-5
+    - gpt-5.2 -> gpt-5-2
+
+    Exports contain only a handful of distinct model strings, so
+    results are memoized.
+    """
+    model_lower = model.lower()
+    for family, display_name in _MODEL_FAMILIES:
+        if family in model_lower:
+            return display_name
+    return _MODEL_ALIASES.get(model_lower, model)
+
+
+@dataclass(slots=True)
+class UsageEvent:
     """Represents a single usage event from the CSV export.
 
     Each row in the CSV file maps to one UsageEvent instance,
     capturing token usage and cost for a single API call.
+    Values are expected to be already typed by the parser, so no
+    validation is performed on construction. Only the YYYY-MM month
+    of the event date is kept, as that is all aggregation needs.
     """
 
-    date: datetime
+    month_key: str
     user: str
     kind: str
     model: str
     max_mode: bool
-    cache_write: int = Field(ge=0, description="Input tokens with cache write")
-    input_no_cache: int = Field(ge=0, description="Input tokens without cache write")
-    cache_read: int = Field(ge=0)
-    output_tokens: int = Field(ge=0)
-    total_tokens: int = Field(ge=0)
-    cost: Decimal = Field(ge=0)
-
-    @property
-    def month_key(self) -> str:
-        """Return YYYY-MM format for grouping."""
-        return self.date.strftime("%Y-%m")
-
-    @property
-    def normalized_model(self) -> str:
-        """Return simplified model name for display.
-
-        Transforms verbose model names to concise display names:
-        - claude-4.5-haiku* -> haiku-4-5
-        - claude-4.5-sonnet* -> sonnet-4-5
-        - claude-4.5-opus* -> opus-4-5
-        - gpt-5.2 -> gpt-5-2
-        """
-        model_lower = self.model.lower()
-        if "haiku" in model_lower:
-            return "haiku-4-5"
-        if "opus" in model_lower:
-            return "opus-4-5"
-        if "sonnet" in model_lower:
-            return "sonnet-4-5"
-        # Normalize gpt-5.2 to gpt-5-2 for consistency
-        if model_lower == "gpt-5.2":
-            return "gpt-5-2"
-        return self.model
-
-
-class ModelStats(BaseModel):
+    cache_write: int  # Input tokens with cache write
+    input_no_cache: int  # Input tokens without cache write
+    cache_read: int
+    output_tokens: int
+    total_tokens: int
+    cost: int  # In units of 1/COST_SCALE USD
+    normalized_model: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Derive the display model name once."""
+        self.normalized_model = normalize_model(self.model)
+
+
+@dataclass(slots=True)
+class ModelStats:
     """Statistics for a single model within a time period."""
 
-    input_tokens: int = Field(default=0, ge=0)
-    output_tokens: int = Field(default=0, ge=0)
-    cache_create: int = Field(default=0, ge=0)
-    cache_read: int = Field(default=0, ge=0)
-    total_tokens: int = Field(default=0, ge=0)
-    cost: Decimal = Field(default=Decimal("0.00"))
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_create: int = 0
+    cache_read: int = 0
+    total_tokens: int = 0
+    cost: int = 0
 
 
-class UserStats(BaseModel):
+@dataclass(slots=True)
+class UserStats:
     """Statistics for a single user within a time period."""
 
-    input_tokens: int = Field(default=0, ge=0)
-    output_tokens: int = Field(default=0, ge=0)
-    cache_create: int = Field(default=0, ge=0)
-    cache_read: int = Field(default=0, ge=0)
-    total_tokens: int = Field(default=0, ge=0)
-    cost: Decimal = Field(default=Decimal("0.00"))
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_create: int = 0
+    cache_read: int = 0
+    total_tokens: int = 0
+    cost: int = 0
 
 
-class AggregatedStats(BaseModel):
+@dataclass(slots=True)
+class AggregatedStats:
     """Aggregated statistics for a month or total.
 
     Accumulates token counts and costs across multiple UsageEvents,
@@ -89,15 +133,52 @@ class AggregatedStats(BaseModel):
 
     month: str
     user: str | None = None
-    models: set[str] = Field(default_factory=set)
-    user_stats: dict[str, UserStats] = Field(default_factory=dict)
-    model_stats: dict[str, ModelStats] = Field(default_factory=dict)
-    input_tokens: int = Field(default=0, ge=0)
-    output_tokens: int = Field(default=0, ge=0)
-    cache_create: int = Field(default=0, ge=0)
-    cache_read: int = Field(default=0, ge=0)
-    total_tokens: int = Field(default=0, ge=0)
-    cost: Decimal = Field(default=Decimal("0.00"))
+    user_stats: dict[str, UserStats] = field(default_factory=dict[str, UserStats])
+    model_stats: dict[str, ModelStats] = field(default_factory=dict[str, ModelStats])
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_create: int = 0
+    cache_read: int = 0
+    total_tokens: int = 0
+    cost: int = 0
+
+    @classmethod
+    def from_counters(
+        cls,
+        month: str,
+        totals: Sequence[int],
+        model_counters: Mapping[str, Sequence[int]],
+        user_counters: Mapping[str, Sequence[int]],
+    ) -> Self:
+        """Build aggregated statistics from raw counters.
+
+        Each counter holds [input_tokens, output_tokens, cache_create,
+        cache_read, total_tokens, cost], the field order of ModelStats
+        and UserStats.
+
+        Args:
+            month: Month key or label for the stats.
+            totals: Counters for the whole period.
+            model_counters: Counters per normalized model name.
+            user_counters: Counters per user.
+
+        Returns:
+            New AggregatedStats instance.
+        """
+        input_tokens, output_tokens, cache_create, cache_read, total_tokens, cost = (
+            totals
+        )
+        return cls(
+            month=month,
+            user_stats={user: UserStats(*c) for user, c in user_counters.items()},
+            model_stats={model: ModelStats(*c) for model, c in model_counters.items()},
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_create=cache_create,
+            cache_read=cache_read,
+            total_tokens=total_tokens,
+            cost=cost,
+        )
 
     def add(self, event: UsageEvent) -> Self:
         """Add a usage event to this aggregation.
@@ -108,39 +189,76 @@ class AggregatedStats(BaseModel):
         Returns:
             Self for method chaining.
         """
-        model_name = event.normalized_model
-        self.models.add(model_name)
+        return self.add_usage(
+            event.user,
+            event.normalized_model,
+            input_tokens=event.input_no_cache,
+            output_tokens=event.output_tokens,
+            cache_create=event.cache_write,
+            cache_read=event.cache_read,
+            total_tokens=event.total_tokens,
+            cost=event.cost,
+        )
+
+    def add_usage(
+        self,
+        user: str,
+        model_name: str,
+        *,
+        input_tokens: int,
+        output_tokens: int,
+        cache_create: int,
+        cache_read: int,
+        total_tokens: int,
+        cost: int,
+    ) -> Self:
+        """Add one usage record's values to this aggregation.
+
+        Lets callers aggregate parsed values directly without
+        building a UsageEvent first.
+
+        Args:
+            user: User email the usage belongs to.
+            model_name: Normalized model name.
+            input_tokens: Input tokens without cache write.
+            output_tokens: Output tokens.
+            cache_create: Input tokens with cache write.
+            cache_read: Cache read tokens.
+            total_tokens: Total tokens.
+            cost: Cost in units of 1/COST_SCALE USD.
 
+        Returns:
+            Self for method chaining.
+        """
         # Track per-model stats
-        if model_name not in self.model_stats:
-            self.model_stats[model_name] = ModelStats()
-        model_stat = self.model_stats[model_name]
-        model_stat.input_tokens += event.input_no_cache
-        model_stat.output_tokens += event.output_tokens
-        model_stat.cache_create += event.cache_write
-        model_stat.cache_read += event.cache_read
-        model_stat.total_tokens += event.total_tokens
-        model_stat.cost += event.cost
+        model_stat = self.model_stats.get(model_name)
+        if model_stat is None:
+            model_stat = self.model_stats[model_name] = ModelStats()
+        model_stat.input_tokens += input_tokens
+        model_stat.output_tokens += output_tokens
+        model_stat.cache_create += cache_create
+        model_stat.cache_read += cache_read
+        model_stat.total_tokens += total_tokens
+        model_stat.cost += cost
 
         # Track per-user stats
-        user = event.user
-        if user not in self.user_stats:
-            self.user_stats[user] = UserStats()
-        user_stat = self.user_stats[user]
-        user_stat.input_tokens += event.input_no_cache
-        user_stat.output_tokens += event.output_tokens
-        user_stat.cache_create += event.cache_write
-        user_stat.cache_read += event.cache_read
-        user_stat.total_tokens += event.total_tokens
-        user_stat.cost += event.cost
+        user_stat = self.user_stats.get(user)
+        if user_stat is None:
+            user_stat = self.user_stats[user] = UserStats()
+        user_stat.input_tokens += input_tokens
+        user_stat.output_tokens += output_tokens
+        user_stat.cache_create += cache_create
+        user_stat.cache_read += cache_read
+        user_stat.total_tokens += total_tokens
+        user_stat.cost += cost
 
         # Track aggregate totals
-        self.input_tokens += event.input_no_cache
-        self.output_tokens += event.output_tokens
-        self.cache_create += event.cache_write
-        self.cache_read += event.cache_read
-        self.total_tokens += event.total_tokens
-        self.cost += event.cost
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cache_create += cache_create
+        self.cache_read += cache_read
+        self.total_tokens += total_tokens
+        self.cost += cost
         return self
 
     def merge(self, other: "AggregatedStats") -> Self:
@@ -152,18 +270,29 @@ class AggregatedStats(BaseModel):
         Returns:
             Self for method chaining.
         """
-        self.models.update(other.models)
+        # Merge model stats
+        for model_name, stats in other.model_stats.items():
+            model_stat = self.model_stats.get(model_name)
+            if model_stat is None:
+                model_stat = self.model_stats[model_name] = ModelStats()
+            model_stat.input_tokens += stats.input_tokens
+            model_stat.output_tokens += stats.output_tokens
+            model_stat.cache_create += stats.cache_create
+            model_stat.cache_read += stats.cache_read
+            model_stat.total_tokens += stats.total_tokens
+            model_stat.cost += stats.cost
 
         # Merge user stats
         for user, stats in other.user_stats.items():
-            if user not in self.user_stats:
-                self.user_stats[user] = UserStats()
-            self.user_stats[user].input_tokens += stats.input_tokens
-            self.user_stats[user].output_tokens += stats.output_tokens
-            self.user_stats[user].cache_create += stats.cache_create
-            self.user_stats[user].cache_read += stats.cache_read
-            self.user_stats[user].total_tokens += stats.total_tokens
-            self.user_stats[user].cost += stats.cost
+            user_stat = self.user_stats.get(user)
+            if user_stat is None:
+                user_stat = self.user_stats[user] = UserStats()
+            user_stat.input_tokens += stats.input_tokens
+            user_stat.output_tokens += stats.output_tokens
+            user_stat.cache_create += stats.cache_create
+            user_stat.cache_read += stats.cache_read
+            user_stat.total_tokens += stats.total_tokens
+            user_stat.cost += stats.cost
 
         self.input_tokens += other.input_tokens
         self.output_tokens += other.output_tokens
@@ -4,14 +4,57 @@ Handles reading and validating CSV exports from Cursor IDE.
 """
 
 import csv
+import io
+import mmap
+import multiprocessing
+import os
 import sys
-from collections.abc import Iterator
-from datetime import datetime
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
+from itertools import pairwise, repeat
 from pathlib import Path
-from typing import TextIO
+from typing import BinaryIO, TextIO
 
-from cursor_usage.models import UsageEvent
+from cursor_usage.models import (
+    AggregatedStats,
+    UsageEvent,
+    normalize_model,
+    to_cost_units,
+)
+
+# Columns read from the Cursor CSV export, in export order
+CSV_COLUMNS: tuple[str, ...] = (
+    "Date",
+    "User",
+    "Kind",
+    "Model",
+    "Max Mode",
+    "Input (w/ Cache Write)",
+    "Input (w/o Cache Write)",
+    "Cache Read",
+    "Output Tokens",
+    "Total Tokens",
+    "Cost",
+)
+
+# Field positions when values are already laid out in CSV_COLUMNS order
+_EXPORT_ORDER: tuple[int, ...] = tuple(range(len(CSV_COLUMNS)))
+
+# Files at least this large are aggregated with pyarrow when it is installed
+ARROW_MIN_FILE_SIZE = 32 * 1024 * 1024
+
+# Otherwise, files get one worker process per this many bytes, up to one
+# per available CPU; files that would get a single worker are not split
+PARALLEL_MIN_FILE_SIZE = 8 * 1024 * 1024
+
+# Bytes copied out of the memory map at a time when looking for the
+# record boundaries that split a file across workers
+_QUOTE_SCAN_WINDOW = 1024 * 1024
+
+# Per month: (totals, per-model, per-user) counters, each laid out as
+# [input, output, cache_create, cache_read, total_tokens, cost]
+_MonthCounters = dict[str, tuple[list[int], dict[str, list[int]], dict[str, list[int]]]]
 
 
 def parse_csv_file(file_path: Path) -> list[UsageEvent]:
@@ -27,15 +70,59 @@ def parse_csv_file(file_path: Path) -> list[UsageEvent]:
         FileNotFoundError: If the file does not exist.
         ValueError: If the CSV format is invalid.
     """
-    with file_path.open(mode="r", encoding="utf-8") as f:
+    with file_path.open(mode="r", encoding="utf-8-sig") as f:
         return list(parse_csv_stream(f))
 
 
+def aggregate_csv_file(file_path: Path) -> list[AggregatedStats]:
+    """Parse a CSV file and aggregate it by month.
+
+    Files of at least ARROW_MIN_FILE_SIZE bytes are handed to the
+    vectorized pyarrow implementation when the optional pyarrow
+    dependency is installed. Otherwise, files of at least twice
+    PARALLEL_MIN_FILE_SIZE bytes are split across one worker process
+    per PARALLEL_MIN_FILE_SIZE bytes, up to one per available CPU.
+    Smaller files are streamed through aggregate_csv_stream().
+    All but the pyarrow path warn about and skip invalid rows; files
+    it rejects as malformed are parsed by the others instead. A leading
+    UTF-8 byte order mark is ignored on every path.
+
+    Args:
+        file_path: Path to the CSV file.
+
+    Returns:
+        List of AggregatedStats sorted by month (ascending).
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    size = file_path.stat().st_size
+    if size >= ARROW_MIN_FILE_SIZE:
+        try:
+            from cursor_usage.arrow_parser import aggregate_csv_file_arrow
+        except ImportError:
+            pass
+        else:
+            try:
+                return aggregate_csv_file_arrow(file_path)
+            except (ValueError, KeyError):
+                pass
+
+    workers = min(_available_cpus(), size // PARALLEL_MIN_FILE_SIZE)
+    if workers > 1:
+        return _aggregate_csv_file_parallel(file_path, workers)
+
+    with file_path.open(mode="r", encoding="utf-8-sig") as f:
+        return aggregate_csv_stream(f)
+
+
 def parse_csv_stream(stream: TextIO) -> Iterator[UsageEvent]:
     """Parse a CSV stream into UsageEvent objects.
 
-    Uses csv.DictReader for robust CSV parsing with proper
-    handling of quoted fields containing commas.
+    Uses csv.reader for robust CSV parsing with proper handling of
+    quoted fields containing commas. Column positions are resolved
+    from the header once, so rows are indexed positionally instead
+    of being turned into dicts.
 
     Args:
         stream: File-like object containing CSV data.
@@ -43,39 +130,418 @@ def parse_csv_stream(stream: TextIO) -> Iterator[UsageEvent]:
     Yields:
         UsageEvent objects for each valid row.
     """
-    reader = csv.DictReader(stream)
+    reader = csv.reader(stream)
+    indices = _read_header(reader)
+    if indices is None:
+        return
 
     for row_num, row in enumerate(reader, start=2):
+        if not row:
+            continue
         try:
-            event = parse_row(row)
+            event = _parse_fields(row, indices)
             yield event
-        except (ValueError, KeyError) as e:
-            print(f"Warning: Skipping row {row_num}: {e}", file=sys.stderr)
+        except (ValueError, IndexError) as e:
+            _warn_skipped(row_num, str(e))
+
+
+def aggregate_csv_stream(stream: TextIO) -> list[AggregatedStats]:
+    """Parse a CSV stream and aggregate it by month in a single pass.
+
+    Equivalent to aggregate_by_month(parse_csv_stream(stream)), but
+    adds each row's values straight into its month bucket without
+    building an intermediate UsageEvent per row. Invalid rows are
+    skipped with a warning as they are read, as in parse_csv_stream().
+
+    Args:
+        stream: File-like object containing CSV data.
+
+    Returns:
+        List of AggregatedStats sorted by month (ascending).
+    """
+    reader = csv.reader(stream)
+    indices = _read_header(reader)
+    if indices is None:
+        return []
+
+    by_month, _ = _aggregate_rows(
+        reader, indices, lambda position, reason: _warn_skipped(position + 2, reason)
+    )
+    return _stats_from_counters(by_month)
+
+
+def _aggregate_csv_file_parallel(
+    file_path: Path, workers: int
+) -> list[AggregatedStats]:
+    """Aggregate a CSV file by month across worker processes.
+
+    The data rows are split into one byte range per worker at record
+    boundaries. Each worker aggregates its range with the same
+    row-by-row logic as aggregate_csv_stream(), and the per-range
+    results are merged. Skipped-row warnings are printed in file order
+    with the same row numbers the serial parser reports.
+
+    Workers are spawned rather than forked: this path also runs after
+    the pyarrow path has failed, when Arrow's thread pool is running,
+    and forking a multi-threaded process can deadlock.
+
+    Args:
+        file_path: Path to the CSV file.
+        workers: Number of worker processes (and byte ranges).
+
+    Returns:
+        List of AggregatedStats sorted by month (ascending).
+    """
+    with (
+        file_path.open(mode="rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        size = len(mm)
+        header_end, *bounds = _record_boundaries(
+            mm, [0, *(size * i // workers for i in range(1, workers))]
+        )
+        header = mm[:header_end].decode("utf-8-sig")
+
+    indices = _read_header(csv.reader(io.StringIO(header)))
+    if indices is None:
+        return []
+
+    ranges = [
+        (start, end)
+        for start, end in pairwise([header_end, *bounds, size])
+        if start < end
+    ]
+    by_month: dict[str, AggregatedStats] = {}
+    first_row = 2
+    with ProcessPoolExecutor(
+        max_workers=len(ranges) or 1, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        for stats_list, skipped, row_count in executor.map(
+            _aggregate_byte_range,
+            repeat(file_path),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+            repeat(indices),
+        ):
+            for stats in stats_list:
+                existing = by_month.get(stats.month)
+                if existing is None:
+                    by_month[stats.month] = stats
+                else:
+                    existing.merge(stats)
+            for position, reason in skipped:
+                _warn_skipped(first_row + position, reason)
+            first_row += row_count
+
+    return [by_month[month_key] for month_key in sorted(by_month)]
+
+
+def _aggregate_byte_range(
+    file_path: Path, start: int, end: int, indices: tuple[int, ...]
+) -> tuple[list[AggregatedStats], list[tuple[int, str]], int]:
+    """Aggregate the CSV records in one byte range of a file.
+
+    Runs in a worker process. The range must start and end on record
+    boundaries. It is streamed from the file, so memory use does not
+    grow with the size of the range.
+
+    Returns:
+        The range's stats sorted by month, its skipped rows as
+        (position numbered from 0 within the range, reason) pairs and
+        its row count.
+    """
+    skipped: list[tuple[int, str]] = []
+    with file_path.open(mode="rb") as f:
+        f.seek(start)
+        text = io.TextIOWrapper(_ByteRange(f, end - start), encoding="utf-8")
+        by_month, row_count = _aggregate_rows(
+            csv.reader(text),
+            indices,
+            lambda position, reason: skipped.append((position, reason)),
+        )
+    return _stats_from_counters(by_month), skipped, row_count
+
+
+class _ByteRange(io.BufferedIOBase):
+    """Read-only binary stream over the next size bytes of a file."""
+
+    def __init__(self, raw: BinaryIO, size: int) -> None:
+        super().__init__()
+        self._raw = raw
+        self._remaining = size
+
+    @property
+    def name(self) -> str:
+        """Name of the underlying file."""
+        return self._raw.name
+
+    def readable(self) -> bool:
+        """Return True; the range is always readable."""
+        return True
+
+    def read(self, size: int | None = -1, /) -> bytes:
+        """Read up to size bytes, or the rest of the range."""
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._raw.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def read1(self, size: int = -1, /) -> bytes:
+        """Read up to size bytes, as read() does."""
+        return self.read(size)
+
+
+def _available_cpus() -> int:
+    """Return the number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _record_boundaries(mm: mmap.mmap, offsets: Iterable[int]) -> list[int]:
+    """Find the first CSV record boundary at or after each offset.
+
+    A boundary is the position just past a newline that is not inside
+    a quoted field. Whether a newline is quoted follows from the parity
+    of the quote characters before it, since escaped quotes ("") come
+    in pairs.
+
+    Args:
+        mm: Memory-mapped CSV file.
+        offsets: Byte offsets in ascending order.
+
+    Returns:
+        One boundary per offset; the file size where none follows.
+    """
+    boundaries: list[int] = []
+    scanned = 0  # Quotes before this position have been counted
+    in_quotes = False
+    for offset in offsets:
+        newline = mm.find(b"\n", max(offset, scanned))
+        while newline != -1:
+            if _count_quotes(mm, scanned, newline) % 2:
+                in_quotes = not in_quotes
+            scanned = newline + 1
+            if not in_quotes:
+                break
+            newline = mm.find(b"\n", scanned)
+        boundaries.append(scanned if newline != -1 else len(mm))
+    return boundaries
+
+
+def _count_quotes(mm: mmap.mmap, start: int, end: int) -> int:
+    """Count the quote characters in mm[start:end].
+
+    The range is copied out of the map one window at a time, so memory
+    use does not grow with the distance between record boundaries.
+    """
+    return sum(
+        mm[pos : min(pos + _QUOTE_SCAN_WINDOW, end)].count(b'"')
+        for pos in range(start, end, _QUOTE_SCAN_WINDOW)
+    )
+
+
+def _aggregate_rows(
+    rows: Iterable[list[str]],
+    indices: tuple[int, ...],
+    on_skip: Callable[[int, str], object],
+) -> tuple[_MonthCounters, int]:
+    """Aggregate CSV data rows into per-month counters.
+
+    Args:
+        rows: Data rows from csv.reader (header already consumed).
+        indices: Column positions as returned by column_indices().
+        on_skip: Called with the position in rows (counted from 0) and
+            the reason for each invalid row, as soon as it is read.
+
+    Returns:
+        The counters by month and the number of rows read.
+    """
+    (
+        date_i,
+        user_i,
+        _kind_i,
+        model_i,
+        _max_mode_i,
+        cache_write_i,
+        input_no_cache_i,
+        cache_read_i,
+        output_tokens_i,
+        total_tokens_i,
+        cost_i,
+    ) = indices
+    by_month: _MonthCounters = {}
+
+    row_count = 0
+    for row_count, row in enumerate(rows, start=1):
+        if not row:
+            continue
+        try:
+            month_key = _parse_month_key(row[date_i])
+            user = row[user_i]
+            model = normalize_model(row[model_i])
+            cache_write = int(row[cache_write_i])
+            input_no_cache = int(row[input_no_cache_i])
+            cache_read = int(row[cache_read_i])
+            output_tokens = int(row[output_tokens_i])
+            total_tokens = int(row[total_tokens_i])
+            cost = _parse_cost(row[cost_i])
+        except (ValueError, IndexError) as e:
+            on_skip(row_count - 1, str(e))
+            continue
+
+        bucket = by_month.get(month_key)
+        if bucket is None:
+            bucket = by_month[month_key] = ([0] * 6, {}, {})
+        totals, model_counters, user_counters = bucket
+        model_counter = model_counters.get(model)
+        if model_counter is None:
+            model_counter = model_counters[model] = [0] * 6
+        user_counter = user_counters.get(user)
+        if user_counter is None:
+            user_counter = user_counters[user] = [0] * 6
+
+        for counter in (totals, model_counter, user_counter):
+            counter[0] += input_no_cache
+            counter[1] += output_tokens
+            counter[2] += cache_write
+            counter[3] += cache_read
+            counter[4] += total_tokens
+            counter[5] += cost
+
+    return by_month, row_count
+
+
+def _stats_from_counters(by_month: _MonthCounters) -> list[AggregatedStats]:
+    """Build AggregatedStats from per-month counters, sorted by month."""
+    return [
+        AggregatedStats.from_counters(month_key, *by_month[month_key])
+        for month_key in sorted(by_month)
+    ]
+
+
+def _warn_skipped(row_num: int, reason: str) -> None:
+    """Print a warning for a skipped row."""
+    print(f"Warning: Skipping row {row_num}: {reason}", file=sys.stderr)
+
+
+def _read_header(reader: Iterator[list[str]]) -> tuple[int, ...] | None:
+    """Read the header row and resolve column positions.
+
+    Returns:
+        Column positions, or None (after a warning for missing
+        columns) if the stream has no usable header.
+    """
+    header = next(reader, None)
+    if header is None:
+        return None
+
+    try:
+        return column_indices(header)
+    except KeyError as e:
+        print(f"Warning: Missing CSV column {e}", file=sys.stderr)
+        return None
+
+
+def column_indices(header: Sequence[str]) -> tuple[int, ...]:
+    """Resolve the position of each required column in a CSV header.
+
+    Args:
+        header: Column names from the first CSV row.
+
+    Returns:
+        Position of each column in CSV_COLUMNS order.
+
+    Raises:
+        KeyError: If a required column is missing from the header.
+    """
+    positions = {name: i for i, name in enumerate(header)}
+    return tuple(positions[name] for name in CSV_COLUMNS)
 
 
 def parse_row(row: dict[str, str]) -> UsageEvent:
     """Convert a CSV row dict to a UsageEvent.
 
     Args:
-        row: Dictionary from csv.DictReader.
+        row: Dictionary mapping column names to values.
+
+    Returns:
+        Parsed UsageEvent.
+    """
+    return _parse_fields([row[name] for name in CSV_COLUMNS], _EXPORT_ORDER)
+
+
+def _parse_fields(row: Sequence[str], indices: tuple[int, ...]) -> UsageEvent:
+    """Convert positional CSV fields to a UsageEvent.
+
+    Args:
+        row: Field values from csv.reader.
+        indices: Column positions as returned by column_indices().
 
     Returns:
         Parsed UsageEvent.
     """
-    date_str = row["Date"].rstrip("Z")
-    if "+" in date_str:
-        date_str = date_str.split("+")[0]
+    (
+        date_i,
+        user_i,
+        kind_i,
+        model_i,
+        max_mode_i,
+        cache_write_i,
+        input_no_cache_i,
+        cache_read_i,
+        output_tokens_i,
+        total_tokens_i,
+        cost_i,
+    ) = indices
 
     return UsageEvent(
-        date=datetime.fromisoformat(date_str),
-        user=row["User"],
-        kind=row["Kind"],
-        model=row["Model"],
-        max_mode=row["Max Mode"].lower() == "yes",
-        cache_write=int(row["Input (w/ Cache Write)"]),
-        input_no_cache=int(row["Input (w/o Cache Write)"]),
-        cache_read=int(row["Cache Read"]),
-        output_tokens=int(row["Output Tokens"]),
-        total_tokens=int(row["Total Tokens"]),
-        cost=Decimal(row["Cost"]),
+        month_key=_parse_month_key(row[date_i]),
+        user=row[user_i],
+        kind=row[kind_i],
+        model=row[model_i],
+        max_mode=row[max_mode_i].lower() == "yes",
+        cache_write=int(row[cache_write_i]),
+        input_no_cache=int(row[input_no_cache_i]),
+        cache_read=int(row[cache_read_i]),
+        output_tokens=int(row[output_tokens_i]),
+        total_tokens=int(row[total_tokens_i]),
+        cost=_parse_cost(row[cost_i]),
     )
+
+
+def _parse_month_key(date_str: str) -> str:
+    """Extract the YYYY-MM month key from an ISO 8601 date string.
+
+    ISO 8601 dates start with YYYY-MM, which is all aggregation needs,
+    so the date itself is never parsed.
+
+    Raises:
+        ValueError: If the string does not start with YYYY-MM, where
+            YYYY and MM are ASCII digits and MM is 01 to 12.
+    """
+    month_key = date_str[:7]
+    year, dash, month = month_key[:4], month_key[4:5], month_key[5:]
+    if not (
+        year.isascii()
+        and year.isdigit()
+        and dash == "-"
+        and month.isascii()
+        and month.isdigit()
+        and "01" <= month <= "12"
+    ):
+        raise ValueError(f"Invalid date: {date_str!r}")
+    return month_key
+
+
+def _parse_cost(value: str) -> int:
+    """Parse a USD cost string into integer cost units.
+
+    Raises:
+        ValueError: If the value is not a finite decimal number.
+    """
+    try:
+        return to_cost_units(Decimal(value))
+    except ArithmeticError:
+        raise ValueError(f"Invalid cost: {value!r}") from None
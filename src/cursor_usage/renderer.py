@@ -5,9 +5,10 @@ the expected output format.
 """
 
 import hashlib
+from functools import cache, lru_cache
 
-from cursor_usage.formatter import format_currency, format_number
-from cursor_usage.models import AggregatedStats
+from cursor_usage.formatter import format_currency
+from cursor_usage.models import AggregatedStats, ModelStats, UserStats
 
 # Box-drawing characters
 BOX_TL = "┌"
@@ -22,9 +23,12 @@ BOX_TJ = "┬"
 BOX_BJ = "┴"
 BOX_X = "┼"
 
-# Column definitions: (name, width, is_numeric)
+# Column definition: (name, width, is_numeric)
+Column = tuple[str, int, bool]
+
+# Column sets are tuples so rendered borders can be cached per set
 # Without -b flag
-COLUMNS_NO_BREAKDOWN: list[tuple[str, int, bool]] = [
+COLUMNS_NO_BREAKDOWN: tuple[Column, ...] = (
     ("Month", 10, False),
     ("Models", 35, False),
     ("Input", 12, True),
@@ -33,10 +37,10 @@ COLUMNS_NO_BREAKDOWN: list[tuple[str, int, bool]] = [
     ("Cache Read", 14, True),
     ("Total Tokens", 15, True),
     ("Cost (USD)", 13, True),
-]
+)
 
 # With -b flag (wider Month column for model breakdown rows)
-COLUMNS_WITH_BREAKDOWN: list[tuple[str, int, bool]] = [
+COLUMNS_WITH_BREAKDOWN: tuple[Column, ...] = (
     ("Month", 24, False),
     ("Models", 35, False),
     ("Input", 12, True),
@@ -45,10 +49,10 @@ COLUMNS_WITH_BREAKDOWN: list[tuple[str, int, bool]] = [
     ("Cache Read", 14, True),
     ("Total Tokens", 15, True),
     ("Cost (USD)", 13, True),
-]
+)
 
 # With -g flag (wider Month column for user breakdown rows, no Models column)
-COLUMNS_GROUP_BY_USER: list[tuple[str, int, bool]] = [
+COLUMNS_GROUP_BY_USER: tuple[Column, ...] = (
     ("Month", 33, False),
     ("Input", 12, True),
     ("Output", 11, True),
@@ -56,12 +60,10 @@ COLUMNS_GROUP_BY_USER: list[tuple[str, int, bool]] = [
     ("Cache Read", 14, True),
     ("Total Tokens", 15, True),
     ("Cost (USD)", 13, True),
-]
+)
 
 
-def get_columns(
-    show_models: bool, group_by_user: bool = False
-) -> list[tuple[str, int, bool]]:
+def get_columns(show_models: bool, group_by_user: bool = False) -> tuple[Column, ...]:
     """Get column definitions based on display options."""
     if group_by_user:
         return COLUMNS_GROUP_BY_USER
@@ -70,17 +72,22 @@ def get_columns(
     return COLUMNS_NO_BREAKDOWN
 
 
+@cache
 def anonymize_email(email: str) -> str:
     """Anonymize an email address using a hash-based approach.
 
+    Uses a 4-byte BLAKE2b digest, which is cheaper than SHA-256 for
+    short inputs. Results are memoized since the same users recur in
+    every month.
+
     Args:
         email: The email address to anonymize.
 
     Returns:
         An anonymized identifier in the format 'User-{hash}'.
     """
-    hash_prefix = hashlib.sha256(email.encode()).hexdigest()[:8]
-    return f"User-{hash_prefix}"
+    digest = hashlib.blake2b(email.encode(), digest_size=4).hexdigest()
+    return f"User-{digest}"
 
 
 def render_table(
@@ -104,13 +111,14 @@ def render_table(
         Complete table as a string.
     """
     columns = get_columns(show_models, group_by_user)
+    separator = render_separator(columns)
     lines: list[str] = []
 
     lines.append(render_border("top", columns))
     lines.append(render_header(columns))
 
     for stats in monthly_stats:
-        lines.append(render_separator(columns))
+        lines.append(separator)
         if group_by_user:
             lines.extend(_render_data_row_grouped(stats, columns))
             lines.extend(_render_user_breakdown_rows(stats, columns, anonymize))
@@ -119,15 +127,16 @@ def render_table(
             if show_models:
                 lines.extend(_render_model_breakdown_rows(stats, columns))
 
-    lines.append(render_separator(columns))
+    lines.append(separator)
     lines.append(_render_total_row(total, columns, group_by_user))
     lines.append(render_border("bottom", columns))
 
     return "\n".join(lines)
 
 
-def render_border(position: str, columns: list[tuple[str, int, bool]]) -> str:
-    """Render top or bottom border line."""
+@lru_cache(maxsize=32)
+def render_border(position: str, columns: tuple[Column, ...]) -> str:
+    """Render top or bottom border line (cached per column set)."""
     if position == "top":
         left, mid, right = BOX_TL, BOX_TJ, BOX_TR
     else:
@@ -137,44 +146,34 @@ def render_border(position: str, columns: list[tuple[str, int, bool]]) -> str:
     return left + mid.join(segments) + right
 
 
-def render_separator(columns: list[tuple[str, int, bool]]) -> str:
-    """Render horizontal separator between rows."""
+@lru_cache(maxsize=32)
+def render_separator(columns: tuple[Column, ...]) -> str:
+    """Render horizontal separator between rows (cached per column set)."""
     segments = [BOX_H * width for _, width, _ in columns]
     return BOX_LJ + BOX_X.join(segments) + BOX_RJ
 
 
-def render_header(columns: list[tuple[str, int, bool]]) -> str:
+def render_header(columns: tuple[Column, ...]) -> str:
     """Render the header row."""
-    cells: list[str] = []
-    for name, width, is_numeric in columns:
-        if is_numeric:
-            cells.append(f" {name:>{width - 2}} ")
-        else:
-            cells.append(f" {name:<{width - 2}} ")
-    return BOX_V + BOX_V.join(cells) + BOX_V
+    return _format_row([name for name, _, _ in columns], columns)
 
 
 def _render_data_row(
     stats: AggregatedStats,
-    columns: list[tuple[str, int, bool]],
+    columns: tuple[Column, ...],
 ) -> list[str]:
     """Render a data row with multi-line model support.
 
     Returns list of lines to support multi-line model display.
     """
-    sorted_models = sorted(stats.models)
+    sorted_models = sorted(stats.model_stats)
 
     # Main row with month totals and model list
     first_model = f"- {sorted_models[0]}" if sorted_models else ""
     values: list[str] = [
         stats.month,
         first_model,
-        format_number(stats.input_tokens),
-        format_number(stats.output_tokens),
-        format_number(stats.cache_create),
-        format_number(stats.cache_read),
-        format_number(stats.total_tokens),
-        format_currency(stats.cost),
+        *_stat_cells(stats),
     ]
 
     lines = [_format_row(values, columns)]
@@ -190,7 +189,7 @@ def _render_data_row(
 
 def _render_model_breakdown_rows(
     stats: AggregatedStats,
-    columns: list[tuple[str, int, bool]],
+    columns: tuple[Column, ...],
 ) -> list[str]:
     """Render per-model breakdown rows with separators.
 
@@ -200,23 +199,18 @@ def _render_model_breakdown_rows(
 
     # Sort models by cost (highest first) for breakdown display
     sorted_models = sorted(
-        stats.model_stats.keys(),
-        key=lambda m: stats.model_stats[m].cost,
+        stats.model_stats.items(),
+        key=lambda item: item[1].cost,
         reverse=True,
     )
 
-    for model in sorted_models:
-        model_stat = stats.model_stats[model]
-        lines.append(render_separator(columns))
+    separator = render_separator(columns)
+    for model, model_stat in sorted_models:
+        lines.append(separator)
         values: list[str] = [
             f"  └─ {model}",
             "",
-            format_number(model_stat.input_tokens),
-            format_number(model_stat.output_tokens),
-            format_number(model_stat.cache_create),
-            format_number(model_stat.cache_read),
-            format_number(model_stat.total_tokens),
-            format_currency(model_stat.cost),
+            *_stat_cells(model_stat),
         ]
         lines.append(_format_row(values, columns))
 
@@ -225,7 +219,7 @@ def _render_model_breakdown_rows(
 
 def _render_data_row_grouped(
     stats: AggregatedStats,
-    columns: list[tuple[str, int, bool]],
+    columns: tuple[Column, ...],
 ) -> list[str]:
     """Render a data row for grouped-by-user output (no Models column).
 
@@ -233,12 +227,7 @@ def _render_data_row_grouped(
     """
     values: list[str] = [
         stats.month,
-        format_number(stats.input_tokens),
-        format_number(stats.output_tokens),
-        format_number(stats.cache_create),
-        format_number(stats.cache_read),
-        format_number(stats.total_tokens),
-        format_currency(stats.cost),
+        *_stat_cells(stats),
     ]
 
     return [_format_row(values, columns)]
@@ -246,7 +235,7 @@ def _render_data_row_grouped(
 
 def _render_user_breakdown_rows(
     stats: AggregatedStats,
-    columns: list[tuple[str, int, bool]],
+    columns: tuple[Column, ...],
     anonymize: bool = False,
 ) -> list[str]:
     """Render per-user breakdown rows with separators.
@@ -263,23 +252,18 @@ def _render_user_breakdown_rows(
 
     # Sort users by cost (highest first) for breakdown display
     sorted_users = sorted(
-        stats.user_stats.keys(),
-        key=lambda u: stats.user_stats[u].cost,
+        stats.user_stats.items(),
+        key=lambda item: item[1].cost,
         reverse=True,
     )
 
-    for user in sorted_users:
-        user_stat = stats.user_stats[user]
+    separator = render_separator(columns)
+    for user, user_stat in sorted_users:
         display_name = anonymize_email(user) if anonymize else user
-        lines.append(render_separator(columns))
+        lines.append(separator)
         values: list[str] = [
             f"  └─ {display_name}",
-            format_number(user_stat.input_tokens),
-            format_number(user_stat.output_tokens),
-            format_number(user_stat.cache_create),
-            format_number(user_stat.cache_read),
-            format_number(user_stat.total_tokens),
-            format_currency(user_stat.cost),
+            *_stat_cells(user_stat),
         ]
         lines.append(_format_row(values, columns))
 
@@ -288,40 +272,50 @@ def _render_user_breakdown_rows(
 
 def _render_total_row(
     total: AggregatedStats,
-    columns: list[tuple[str, int, bool]],
+    columns: tuple[Column, ...],
     group_by_user: bool = False,
 ) -> str:
     """Render the grand total row."""
     if group_by_user:
         values: list[str] = [
             "Total",
-            format_number(total.input_tokens),
-            format_number(total.output_tokens),
-            format_number(total.cache_create),
-            format_number(total.cache_read),
-            format_number(total.total_tokens),
-            format_currency(total.cost),
+            *_stat_cells(total),
         ]
     else:
         values = [
             "Total",
             "",
-            format_number(total.input_tokens),
-            format_number(total.output_tokens),
-            format_number(total.cache_create),
-            format_number(total.cache_read),
-            format_number(total.total_tokens),
-            format_currency(total.cost),
+            *_stat_cells(total),
         ]
     return _format_row(values, columns)
 
 
-def _format_row(values: list[str], columns: list[tuple[str, int, bool]]) -> str:
+def _stat_cells(stats: AggregatedStats | ModelStats | UserStats) -> list[str]:
+    """Format the token and cost cells shared by every data row."""
+    return [
+        f"{stats.input_tokens:,}",
+        f"{stats.output_tokens:,}",
+        f"{stats.cache_create:,}",
+        f"{stats.cache_read:,}",
+        f"{stats.total_tokens:,}",
+        format_currency(stats.cost),
+    ]
+
+
+def _format_row(values: list[str], columns: tuple[Column, ...]) -> str:
     """Format a list of values into a table row."""
-    cells: list[str] = []
-    for (_, width, is_numeric), value in zip(columns, values, strict=True):
-        if is_numeric and value:
-            cells.append(f" {value:>{width - 2}} ")
-        else:
-            cells.append(f" {value:<{width - 2}} ")
+    return _row_template(columns).format(*values)
+
+
+@lru_cache(maxsize=32)
+def _row_template(columns: tuple[Column, ...]) -> str:
+    """Build a str.format template for one row of the given columns.
+
+    Width and alignment are baked into the template once per column
+    set, so formatting a row does not rebuild per-cell format specs.
+    """
+    cells = [
+        f" {{:{'>' if is_numeric else '<'}{width - 2}}} "
+        for _, width, is_numeric in columns
+    ]
     return BOX_V + BOX_V.join(cells) + BOX_V
@@ -1,55 +1,67 @@
 """Shared pytest fixtures for cursor-usage tests."""
 
-import tempfile
-from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
 
 import pytest
 
-from cursor_usage.models import UsageEvent
-from tests.fixtures.sample_data import make_csv_content, make_csv_row, make_usage_event
+from cursor_usage.models import AggregatedStats, UsageEvent
+from tests.fixtures.sample_data import (
+    DEFAULT_EVENT,
+    make_csv_content,
+    make_csv_row,
+    make_usage_event,
+)
 
 
 @pytest.fixture
 def single_event() -> UsageEvent:
     """A single usage event with default values."""
-    return make_usage_event()
+    return DEFAULT_EVENT
 
 
-@pytest.fixture
-def multi_user_events() -> list[UsageEvent]:
+@pytest.fixture(scope="session")
+def single_event_stats() -> AggregatedStats:
+    """Stats for one month holding only the single_event event.
+
+    Shared by all tests; copy.deepcopy() it before modifying it.
+    """
+    return AggregatedStats(month="2026-01").add(DEFAULT_EVENT)
+
+
+@pytest.fixture(scope="session")
+def multi_user_events() -> tuple[UsageEvent, ...]:
     """Events from multiple users for testing user grouping."""
-    return [
+    return (
         make_usage_event(user="alice@example.com", cost="0.10"),
         make_usage_event(user="bob@example.com", cost="0.20"),
         make_usage_event(user="alice@example.com", cost="0.15"),
-    ]
+    )
 
 
-@pytest.fixture
-def multi_month_events() -> list[UsageEvent]:
+@pytest.fixture(scope="session")
+def multi_month_events() -> tuple[UsageEvent, ...]:
     """Events spanning multiple months for aggregation testing."""
-    return [
+    return (
         make_usage_event(date=datetime(2026, 1, 10), cost="0.10"),
         make_usage_event(date=datetime(2026, 1, 20), cost="0.15"),
         make_usage_event(date=datetime(2026, 2, 5), cost="0.20"),
         make_usage_event(date=datetime(2026, 2, 15), cost="0.25"),
-    ]
+    )
 
 
-@pytest.fixture
-def multi_model_events() -> list[UsageEvent]:
+@pytest.fixture(scope="session")
+def multi_model_events() -> tuple[UsageEvent, ...]:
     """Events with different models for breakdown testing."""
-    return [
+    return (
         make_usage_event(model="claude-4.5-sonnet", cost="0.10"),
         make_usage_event(model="claude-4.5-haiku", cost="0.05"),
         make_usage_event(model="claude-4.5-opus", cost="0.30"),
         make_usage_event(model="gpt-5.2", cost="0.15"),
-    ]
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_csv_content() -> str:
     """Valid CSV content for parser testing."""
     return make_csv_content(
@@ -60,12 +72,42 @@ def sample_csv_content() -> str:
     )
 
 
-@pytest.fixture
-def temp_csv_file(sample_csv_content: str) -> Iterator[Path]:
-    """Create a temporary CSV file for file-based tests."""
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".csv", delete=False, encoding="utf-8"
-    ) as f:
-        f.write(sample_csv_content)
-        f.flush()
-        yield Path(f.name)
+def _write_csv_file(tmp_path_factory: pytest.TempPathFactory, content: str) -> Path:
+    """Write CSV content to a file in a fresh session temp directory.
+
+    The file is shared by every test using the fixture, so tests must
+    not modify it; copy it into tmp_path with shutil.copy() if needed.
+    """
+    path = tmp_path_factory.mktemp("csv") / "usage.csv"
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+@pytest.fixture(scope="session")
+def temp_csv_file(
+    tmp_path_factory: pytest.TempPathFactory, sample_csv_content: str
+) -> Path:
+    """sample_csv_content written once per session for file-based tests."""
+    return _write_csv_file(tmp_path_factory, sample_csv_content)
+
+
+@pytest.fixture(scope="session")
+def csv_file_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """CSV file with two users and models, for CLI testing."""
+    content = make_csv_content(
+        [
+            make_csv_row(
+                date="2026-01-15T10:00:00.000Z",
+                user="alice@example.com",
+                model="claude-4.5-sonnet",
+                cost="0.25",
+            ),
+            make_csv_row(
+                date="2026-01-16T11:00:00.000Z",
+                user="bob@example.com",
+                model="claude-4.5-haiku",
+                cost="0.10",
+            ),
+        ]
+    )
+    return _write_csv_file(tmp_path_factory, content)
@@ -1,11 +1,42 @@
 """Factory functions for creating test data without real emails."""
 
+import csv
 from datetime import datetime
 from decimal import Decimal
+from functools import cache
+from io import StringIO
+from operator import itemgetter
 
-from cursor_usage.models import UsageEvent
+from cursor_usage.models import UsageEvent, to_cost_units
 
+# Columns of the Cursor CSV export, in export order
+CSV_COLUMNS: tuple[str, ...] = (
+    "Date",
+    "User",
+    "Kind",
+    "Model",
+    "Max Mode",
+    "Input (w/ Cache Write)",
+    "Input (w/o Cache Write)",
+    "Cache Read",
+    "Output Tokens",
+    "Total Tokens",
+    "Cost",
+)
+CSV_HEADER = ",".join(CSV_COLUMNS)
+_csv_fields = itemgetter(*CSV_COLUMNS)
 
+
+@cache
+def usd(amount: str) -> int:
+    """Convert a USD amount string to integer cost units.
+
+    Tests reuse a handful of amounts, so conversions are memoized.
+    """
+    return to_cost_units(Decimal(amount))
+
+
+@cache
 def make_usage_event(
     date: datetime | None = None,
     user: str = "alice@example.com",
@@ -19,9 +50,14 @@ def make_usage_event(
     total_tokens: int = 3800,
     cost: Decimal | str = "0.05",
 ) -> UsageEvent:
-    """Create a UsageEvent with sensible defaults for testing."""
+    """Create a UsageEvent with sensible defaults for testing.
+
+    Events are memoized per argument set, so repeated calls return the
+    same instance. Tests must not modify the returned event.
+    """
+    date = date or datetime(2026, 1, 15, 10, 30, 0)
     return UsageEvent(
-        date=date or datetime(2026, 1, 15, 10, 30, 0),
+        month_key=f"{date:%Y-%m}",
         user=user,
         kind=kind,
         model=model,
@@ -31,10 +67,15 @@ def make_usage_event(
         cache_read=cache_read,
         output_tokens=output_tokens,
         total_tokens=total_tokens,
-        cost=Decimal(cost) if isinstance(cost, str) else cost,
+        cost=usd(cost) if isinstance(cost, str) else to_cost_units(cost),
     )
 
 
+# Event with every default, e.g. for single-event aggregations.
+# Shared by all tests, so never modify it in place.
+DEFAULT_EVENT: UsageEvent = make_usage_event()
+
+
 def make_csv_row(
     date: str = "2026-01-15T10:30:00.000Z",
     user: str = "alice@example.com",
@@ -49,43 +90,38 @@ def make_csv_row(
     cost: str = "0.05",
 ) -> dict[str, str]:
     """Create a CSV row dict as returned by csv.DictReader."""
-    return {
-        "Date": date,
-        "User": user,
-        "Kind": kind,
-        "Model": model,
-        "Max Mode": max_mode,
-        "Input (w/ Cache Write)": cache_write,
-        "Input (w/o Cache Write)": input_no_cache,
-        "Cache Read": cache_read,
-        "Output Tokens": output_tokens,
-        "Total Tokens": total_tokens,
-        "Cost": cost,
-    }
+    values = (
+        date,
+        user,
+        kind,
+        model,
+        max_mode,
+        cache_write,
+        input_no_cache,
+        cache_read,
+        output_tokens,
+        total_tokens,
+        cost,
+    )
+    return dict(zip(CSV_COLUMNS, values, strict=True))
+
+
+# Default row for single-field overrides, e.g. BASE_ROW | {"Cost": "0.10"}.
+# Shared by all tests, so never modify it in place.
+BASE_ROW: dict[str, str] = make_csv_row()
 
 
 def make_csv_content(rows: list[dict[str, str]] | None = None) -> str:
-    """Generate CSV content string from rows."""
-    header = "Date,User,Kind,Model,Max Mode,Input (w/ Cache Write),Input (w/o Cache Write),Cache Read,Output Tokens,Total Tokens,Cost"
+    """Generate CSV content string from rows.
+
+    Fields are quoted only where needed. The content has no trailing
+    newline, so tests can append raw rows after a "\\n".
+    """
     if rows is None:
         rows = [make_csv_row()]
 
-    lines = [header]
-    for row in rows:
-        line = ",".join(
-            [
-                f'"{row["Date"]}"',
-                f'"{row["User"]}"',
-                f'"{row["Kind"]}"',
-                f'"{row["Model"]}"',
-                f'"{row["Max Mode"]}"',
-                row["Input (w/ Cache Write)"],
-                row["Input (w/o Cache Write)"],
-                row["Cache Read"],
-                row["Output Tokens"],
-                row["Total Tokens"],
-                row["Cost"],
-            ]
-        )
-        lines.append(line)
-    return "\n".join(lines)
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    writer.writerows(map(_csv_fields, rows))
+    return buffer.getvalue().removesuffix("\n")
@@ -1,56 +1,40 @@
 """Integration tests for cursor_usage.cli module."""
 
 import re
-import tempfile
-from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
-from typer.testing import CliRunner
+import typer
+from typer.testing import CliRunner, Result
 
-from cursor_usage.cli import app
-from tests.fixtures.sample_data import make_csv_content, make_csv_row
+from cursor_usage.cli import analyze, app
+from tests.fixtures.sample_data import CSV_HEADER
 
-runner = CliRunner(env={"NO_COLOR": "1"})
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
 
 
 def strip_ansi(text: str) -> str:
     """Remove ANSI escape codes from text."""
-    return re.sub(r"\x1b\[[0-9;]*m", "", text)
-
-
-@pytest.fixture
-def csv_file_path() -> Iterator[Path]:
-    """Create a temporary CSV file for CLI testing."""
-    content = make_csv_content(
-        [
-            make_csv_row(
-                date="2026-01-15T10:00:00.000Z",
-                user="alice@example.com",
-                model="claude-4.5-sonnet",
-                cost="0.25",
-            ),
-            make_csv_row(
-                date="2026-01-16T11:00:00.000Z",
-                user="bob@example.com",
-                model="claude-4.5-haiku",
-                cost="0.10",
-            ),
-        ]
-    )
-
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".csv", delete=False, encoding="utf-8"
-    ) as f:
-        f.write(content)
-        f.flush()
-        yield Path(f.name)
+    return _ANSI_RE.sub("", text)
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    """CLI runner with colored output disabled."""
+    return CliRunner(env={"NO_COLOR": "1"})
+
+
+@pytest.fixture(scope="module")
+def help_result(runner: CliRunner) -> Result:
+    """Output of --help, rendered once for all help tests."""
+    return runner.invoke(app, ["--help"])
 
 
 class TestAnalyzeCommand:
     """Tests for the analyze command."""
 
-    def test_basic_analyze(self, csv_file_path: Path) -> None:
+    @pytest.mark.slow
+    def test_basic_analyze(self, runner: CliRunner, csv_file_path: Path) -> None:
         """Basic analyze command outputs table."""
         result = runner.invoke(app, ["-f", str(csv_file_path)])
 
@@ -58,99 +42,105 @@ class TestAnalyzeCommand:
         assert "2026-01" in result.output
         assert "Total" in result.output
 
-    def test_file_not_found(self, tmp_path: Path) -> None:
+    @pytest.mark.slow
+    def test_file_not_found(self, runner: CliRunner, tmp_path: Path) -> None:
         """Missing file returns error."""
         missing = tmp_path / "nonexistent.csv"
         result = runner.invoke(app, ["-f", str(missing)])
 
         assert result.exit_code != 0
 
-    def test_output_file_option(self, csv_file_path: Path, tmp_path: Path) -> None:
+    def test_output_file_option(
+        self,
+        csv_file_path: Path,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
         """--output/-o writes to file."""
         output = tmp_path / "result.txt"
-        result = runner.invoke(app, ["-f", str(csv_file_path), "-o", str(output)])
+        analyze(csv_file=csv_file_path, output_file=output)
 
-        assert result.exit_code == 0
+        assert f"Output written to {output}" in capsys.readouterr().out
         assert output.exists()
         content = output.read_text()
         assert "2026-01" in content
 
-    def test_breakdown_flag(self, csv_file_path: Path) -> None:
+    def test_breakdown_flag(
+        self, csv_file_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
         """-b flag shows model breakdown."""
-        result = runner.invoke(app, ["-f", str(csv_file_path), "-b"])
+        analyze(csv_file=csv_file_path, breakdown=True)
+        output = capsys.readouterr().out
 
-        assert result.exit_code == 0
-        assert "sonnet-4-5" in result.output
-        assert "haiku-4-5" in result.output
+        assert "sonnet-4-5" in output
+        assert "haiku-4-5" in output
 
-    def test_group_by_user_flag(self, csv_file_path: Path) -> None:
+    def test_group_by_user_flag(
+        self, csv_file_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
         """-g flag shows per-user breakdown."""
-        result = runner.invoke(app, ["-f", str(csv_file_path), "-g"])
+        analyze(csv_file=csv_file_path, group_by_user=True)
+        output = capsys.readouterr().out
 
-        assert result.exit_code == 0
-        assert "alice@example.com" in result.output
-        assert "bob@example.com" in result.output
+        assert "alice@example.com" in output
+        assert "bob@example.com" in output
 
-    def test_anonymize_flag(self, csv_file_path: Path) -> None:
+    def test_anonymize_flag(
+        self, csv_file_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
         """-a flag anonymizes emails (requires -g)."""
-        result = runner.invoke(app, ["-f", str(csv_file_path), "-g", "-a"])
+        analyze(csv_file=csv_file_path, group_by_user=True, anonymize=True)
+        output = capsys.readouterr().out
 
-        assert result.exit_code == 0
-        assert "alice@example.com" not in result.output
-        assert "bob@example.com" not in result.output
-        assert "User-" in result.output
+        assert "alice@example.com" not in output
+        assert "bob@example.com" not in output
+        assert "User-" in output
 
     def test_breakdown_and_user_group_mutually_exclusive(
         self, csv_file_path: Path
     ) -> None:
         """-b and -g flags cannot be used together."""
-        result = runner.invoke(app, ["-f", str(csv_file_path), "-b", "-g"])
-
-        assert result.exit_code != 0
-        assert "Cannot use both" in result.output
+        with pytest.raises(typer.BadParameter, match="Cannot use both"):
+            analyze(csv_file=csv_file_path, breakdown=True, group_by_user=True)
 
     def test_anonymize_requires_group_by_user(self, csv_file_path: Path) -> None:
         """-a flag requires -g flag."""
-        result = runner.invoke(app, ["-f", str(csv_file_path), "-a"])
-
-        assert result.exit_code != 0
-        assert "requires" in result.output
+        with pytest.raises(typer.BadParameter, match="requires"):
+            analyze(csv_file=csv_file_path, anonymize=True)
 
 
 class TestEmptyCsv:
     """Tests for empty/invalid CSV handling."""
 
-    def test_empty_csv_header_only(self, tmp_path: Path) -> None:
+    def test_empty_csv_header_only(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
         """CSV with only header shows error message."""
         csv_file = tmp_path / "empty.csv"
-        csv_file.write_text(
-            "Date,User,Kind,Model,Max Mode,Input (w/ Cache Write),"
-            "Input (w/o Cache Write),Cache Read,Output Tokens,Total Tokens,Cost\n"
-        )
+        csv_file.write_text(CSV_HEADER + "\n")
 
-        result = runner.invoke(app, ["-f", str(csv_file)])
+        with pytest.raises(typer.Exit) as exc_info:
+            analyze(csv_file=csv_file)
 
-        assert result.exit_code == 1
-        assert "No valid usage events" in result.output
+        assert exc_info.value.exit_code == 1
+        assert "No valid usage events" in capsys.readouterr().err
 
 
+@pytest.mark.slow
 class TestHelp:
     """Tests for help output."""
 
-    def test_app_help(self) -> None:
+    def test_app_help(self, help_result: Result) -> None:
         """--help shows usage information."""
-        result = runner.invoke(app, ["--help"])
+        assert help_result.exit_code == 0
+        assert "Analyze" in help_result.output
+        assert "Cursor" in help_result.output
 
-        assert result.exit_code == 0
-        assert "Analyze" in result.output
-        assert "Cursor" in result.output
-
-    def test_analyze_help(self) -> None:
+    def test_analyze_help(self, help_result: Result) -> None:
         """--help shows command options."""
-        result = runner.invoke(app, ["--help"])
-        output = strip_ansi(result.output)
+        output = strip_ansi(help_result.output)
 
-        assert result.exit_code == 0
+        assert help_result.exit_code == 0
         assert "--file" in output
         assert "--breakdown" in output
         assert "--group-by-user" in output
@@ -1,11 +1,10 @@
 """Unit tests for cursor_usage.aggregator module."""
 
 from datetime import datetime
-from decimal import Decimal
 
 from cursor_usage.aggregator import aggregate_by_month, compute_grand_total
 from cursor_usage.models import UsageEvent
-from tests.fixtures.sample_data import make_usage_event
+from tests.fixtures.sample_data import make_usage_event, usd
 
 
 class TestAggregateByMonth:
@@ -16,6 +15,12 @@ class TestAggregateByMonth:
         result = aggregate_by_month([])
         assert result == []
 
+    def test_accepts_iterator(self, multi_month_events: tuple[UsageEvent, ...]) -> None:
+        """Events can be streamed from an iterator in a single pass."""
+        result = aggregate_by_month(iter(multi_month_events))
+
+        assert [s.month for s in result] == ["2026-01", "2026-02"]
+
     def test_single_event_single_month(self, single_event: UsageEvent) -> None:
         """Single event returns single monthly aggregation."""
         result = aggregate_by_month([single_event])
@@ -36,9 +41,11 @@ class TestAggregateByMonth:
 
         assert len(result) == 1
         assert result[0].month == "2026-01"
-        assert result[0].cost == Decimal("0.45")
+        assert result[0].cost == usd("0.45")
 
-    def test_events_across_months(self, multi_month_events: list[UsageEvent]) -> None:
+    def test_events_across_months(
+        self, multi_month_events: tuple[UsageEvent, ...]
+    ) -> None:
         """Events are grouped by month correctly."""
         result = aggregate_by_month(multi_month_events)
 
@@ -59,14 +66,18 @@ class TestAggregateByMonth:
         months = [s.month for s in result]
         assert months == ["2026-01", "2026-02", "2026-03"]
 
-    def test_model_stats_populated(self, multi_model_events: list[UsageEvent]) -> None:
+    def test_model_stats_populated(
+        self, multi_model_events: tuple[UsageEvent, ...]
+    ) -> None:
         """Each month's model_stats contains per-model data."""
         result = aggregate_by_month(multi_model_events)
 
         assert len(result) == 1
         assert len(result[0].model_stats) == 4  # 4 different models
 
-    def test_user_stats_populated(self, multi_user_events: list[UsageEvent]) -> None:
+    def test_user_stats_populated(
+        self, multi_user_events: tuple[UsageEvent, ...]
+    ) -> None:
         """Each month's user_stats contains per-user data."""
         result = aggregate_by_month(multi_user_events)
 
@@ -83,7 +94,7 @@ class TestComputeGrandTotal:
         result = compute_grand_total([])
 
         assert result.month == "Total"
-        assert result.cost == Decimal("0.00")
+        assert result.cost == 0
         assert result.total_tokens == 0
 
     def test_single_month_total(self) -> None:
@@ -94,7 +105,7 @@ class TestComputeGrandTotal:
         total = compute_grand_total(monthly)
 
         assert total.month == "Total"
-        assert total.cost == Decimal("0.50")
+        assert total.cost == usd("0.50")
         assert total.total_tokens == 1000
 
     def test_multiple_months_summed(self) -> None:
@@ -108,7 +119,7 @@ class TestComputeGrandTotal:
 
         total = compute_grand_total(monthly)
 
-        assert total.cost == Decimal("0.60")
+        assert total.cost == usd("0.60")
         assert total.total_tokens == 600
 
     def test_user_stats_merged(self) -> None:
@@ -130,4 +141,4 @@ class TestComputeGrandTotal:
 
         assert "alice@example.com" in total.user_stats
         assert "bob@example.com" in total.user_stats
-        assert total.user_stats["alice@example.com"].cost == Decimal("0.25")
+        assert total.user_stats["alice@example.com"].cost == usd("0.25")
@@ -0,0 +1,129 @@
+"""Unit tests for cursor_usage.arrow_parser module."""
+
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from cursor_usage import parser
+from cursor_usage.parser import CSV_COLUMNS, aggregate_csv_stream
+from tests.fixtures.sample_data import make_csv_content, make_csv_row, usd
+
+pytest.importorskip("pyarrow")
+
+from cursor_usage.arrow_parser import aggregate_csv_file_arrow  # noqa: E402
+
+
+def _write_csv(tmp_path: Path, content: str) -> Path:
+    path = tmp_path / "usage.csv"
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+class TestAggregateCsvFileArrow:
+    """Tests for aggregate_csv_file_arrow function."""
+
+    def test_matches_stream_aggregation(self, tmp_path: Path) -> None:
+        """Arrow aggregation matches the row-by-row parser."""
+        content = make_csv_content(
+            [
+                make_csv_row(date="2026-02-01T09:00:00.000Z", cost="0.20"),
+                make_csv_row(
+                    date="2026-01-15T10:30:00.000Z",
+                    user="bob@example.com",
+                    model="claude-4.5-haiku",
+                    cost="0.10",
+                ),
+                make_csv_row(date="2026-01-20T11:00:00.000Z", model="gpt-5.2"),
+                make_csv_row(date="2026-01-21T11:00:00.000Z", model="model, comma"),
+            ]
+        )
+
+        result = aggregate_csv_file_arrow(_write_csv(tmp_path, content))
+
+        assert result == aggregate_csv_stream(StringIO(content))
+        assert [s.month for s in result] == ["2026-01", "2026-02"]
+
+    def test_breakdown_order_matches_stream(self, tmp_path: Path) -> None:
+        """Models and users keep first-appearance order, as in the stream parser."""
+        content = make_csv_content(
+            [
+                make_csv_row(
+                    user=f"user{i % 7}@example.com",
+                    model=("claude-4.5-opus", "gpt-5.2", "claude-4.5-haiku")[i % 3],
+                    cost="0",
+                )
+                for i in range(1, 50)
+            ]
+        )
+
+        (result,) = aggregate_csv_file_arrow(_write_csv(tmp_path, content))
+        (expected,) = aggregate_csv_stream(StringIO(content))
+
+        assert list(result.model_stats) == list(expected.model_stats)
+        assert list(result.user_stats) == list(expected.user_stats)
+
+    def test_sub_cent_costs_summed_exactly(self, tmp_path: Path) -> None:
+        """Sub-cent costs add up exactly, like the row-by-row parser."""
+        content = make_csv_content([make_csv_row(cost="0.00005")] * 200)
+
+        result = aggregate_csv_file_arrow(_write_csv(tmp_path, content))
+
+        assert result[0].cost == usd("0.01")
+
+    def test_finer_costs_rounded_after_fallback(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Costs finer than one unit fail here; the fallback rounds and keeps them."""
+        content = make_csv_content(
+            [make_csv_row(cost="0.030000000000000002"), make_csv_row(cost="0.05")]
+        )
+        path = _write_csv(tmp_path, content)
+        monkeypatch.setattr(parser, "ARROW_MIN_FILE_SIZE", 0)
+
+        with pytest.raises(ValueError):
+            aggregate_csv_file_arrow(path)
+        (result,) = parser.aggregate_csv_file(path)
+        assert result.total_tokens == 2 * 3800
+        assert result.cost == usd("0.08")
+
+    def test_invalid_integer_raises_valueerror(self, tmp_path: Path) -> None:
+        """Malformed rows raise ValueError so callers can fall back."""
+        content = make_csv_content([make_csv_row(total_tokens="not_a_number")])
+
+        with pytest.raises(ValueError):
+            aggregate_csv_file_arrow(_write_csv(tmp_path, content))
+
+    @pytest.mark.parametrize(
+        "date", ["15/01/2026", "2026-1-15T10:30:00.000Z", "2026-13-15T10:30:00.000Z"]
+    )
+    def test_invalid_date_raises_valueerror(self, tmp_path: Path, date: str) -> None:
+        """Dates not starting with YYYY-MM raise ValueError."""
+        content = make_csv_content([make_csv_row(date=date)])
+
+        with pytest.raises(ValueError):
+            aggregate_csv_file_arrow(_write_csv(tmp_path, content))
+
+    def test_byte_order_mark_ignored(self, tmp_path: Path) -> None:
+        """A leading UTF-8 BOM is dropped, as in the row-by-row parser."""
+        content = make_csv_content([make_csv_row()])
+
+        result = aggregate_csv_file_arrow(_write_csv(tmp_path, "\ufeff" + content))
+
+        assert result == aggregate_csv_stream(StringIO(content))
+
+    def test_unread_column_still_required(self, tmp_path: Path) -> None:
+        """A column the aggregation does not read is still required."""
+        columns = [name for name in CSV_COLUMNS if name != "Max Mode"]
+        row = make_csv_row()
+        content = ",".join(columns) + "\n" + ",".join(row[c] for c in columns) + "\n"
+
+        with pytest.raises(KeyError):
+            aggregate_csv_file_arrow(_write_csv(tmp_path, content))
+
+    def test_missing_column_raises_keyerror(self, tmp_path: Path) -> None:
+        """A header without a required column raises KeyError."""
+        path = _write_csv(tmp_path, "Date,User\n2026-01-15,alice@example.com\n")
+
+        with pytest.raises(KeyError):
+            aggregate_csv_file_arrow(path)
@@ -1,61 +1,58 @@
 """Unit tests for cursor_usage.formatter module."""
 
-from decimal import Decimal
+import pytest
 
 from cursor_usage.formatter import format_currency, format_number
+from tests.fixtures.sample_data import usd
 
 
 class TestFormatNumber:
     """Tests for format_number function."""
 
-    def test_zero(self) -> None:
-        """Zero is formatted without comma."""
-        assert format_number(0) == "0"
-
-    def test_small_number(self) -> None:
-        """Small numbers have no comma."""
-        assert format_number(1) == "1"
-        assert format_number(999) == "999"
-
-    def test_thousands_separator(self) -> None:
-        """Numbers >= 1000 have comma separator."""
-        assert format_number(1000) == "1,000"
-        assert format_number(1234) == "1,234"
-
-    def test_millions(self) -> None:
-        """Millions have two comma separators."""
-        assert format_number(1000000) == "1,000,000"
-        assert format_number(1234567) == "1,234,567"
-
-    def test_large_numbers(self) -> None:
-        """Very large numbers are formatted correctly."""
-        assert format_number(1234567890) == "1,234,567,890"
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            (0, "0"),
+            (1, "1"),
+            (999, "999"),
+            (1000, "1,000"),
+            (1234, "1,234"),
+            (1_000_000, "1,000,000"),
+            (1_234_567, "1,234,567"),
+            (1_234_567_890, "1,234,567,890"),
+        ],
+    )
+    def test_format_number(self, value: int, expected: str) -> None:
+        """Numbers >= 1000 get a comma every three digits."""
+        assert format_number(value) == expected
 
 
 class TestFormatCurrency:
-    """Tests for format_currency function."""
-
-    def test_adds_dollar_sign(self) -> None:
-        """Currency starts with dollar sign."""
-        result = format_currency(Decimal("0"))
-        assert result.startswith("$")
-
-    def test_zero(self) -> None:
-        """Zero shows as $0.00."""
-        assert format_currency(Decimal("0")) == "$0.00"
-
-    def test_two_decimal_places(self) -> None:
-        """Currency shows exactly two decimal places."""
-        assert format_currency(Decimal("1")) == "$1.00"
-        assert format_currency(Decimal("1.5")) == "$1.50"
-        assert format_currency(Decimal("1.234")) == "$1.23"
-
-    def test_thousands_separator(self) -> None:
-        """Large currency values have comma separators."""
-        assert format_currency(Decimal("1000")) == "$1,000.00"
-        assert format_currency(Decimal("1234.56")) == "$1,234.56"
-
-    def test_rounding(self) -> None:
-        """Values are rounded to 2 decimal places."""
-        assert format_currency(Decimal("1.999")) == "$2.00"
-        assert format_currency(Decimal("1.994")) == "$1.99"
+    """Tests for format_currency function (values in 1/COST_SCALE USD units)."""
+
+    @pytest.mark.parametrize(
+        ("amount", "expected"),
+        [
+            ("0", "$0.00"),
+            # Exactly two decimal places
+            ("1", "$1.00"),
+            ("1.5", "$1.50"),
+            ("1.234", "$1.23"),
+            # Thousands separator
+            ("1000", "$1,000.00"),
+            ("1234.56", "$1,234.56"),
+            # Rounded to whole cents
+            ("1.999", "$2.00"),
+            ("1.994", "$1.99"),
+            # Exact half cents round to the even cent, like Decimal
+            ("0.005", "$0.00"),
+            ("0.015", "$0.02"),
+            # Just over half a cent rounds up
+            ("0.0050000001", "$0.01"),
+            # Negative amounts keep the sign after the dollar sign
+            ("-1.50", "$-1.50"),
+        ],
+    )
+    def test_format_currency(self, amount: str, expected: str) -> None:
+        """Cost units are formatted as dollars and cents."""
+        assert format_currency(usd(amount)) == expected
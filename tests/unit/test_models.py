@@ -1,13 +1,45 @@
 """Unit tests for cursor_usage.models module."""
 
-from datetime import datetime
 from decimal import Decimal
 
 import pytest
-from pydantic import ValidationError
 
-from cursor_usage.models import AggregatedStats, ModelStats, UsageEvent, UserStats
-from tests.fixtures.sample_data import make_usage_event
+from cursor_usage.models import (
+    COST_SCALE,
+    AggregatedStats,
+    ModelStats,
+    UsageEvent,
+    UserStats,
+    to_cost_units,
+)
+from tests.fixtures.sample_data import make_usage_event, usd
+
+
+class TestToCostUnits:
+    """Tests for to_cost_units function."""
+
+    def test_whole_cents(self) -> None:
+        """USD amounts convert to 1/COST_SCALE USD units."""
+        assert to_cost_units(Decimal("0.05")) == 5 * COST_SCALE // 100
+        assert to_cost_units(Decimal("1234.56")) == 123_456 * COST_SCALE // 100
+
+    def test_smallest_unit_is_exact(self) -> None:
+        """Amounts down to one cost unit convert without rounding."""
+        assert to_cost_units(Decimal("0.00004")) == 4 * COST_SCALE // 100_000
+        assert to_cost_units(Decimal(1) / COST_SCALE) == 1
+        assert to_cost_units(Decimal("1.5000000000000")) == 3 * COST_SCALE // 2
+
+    def test_finer_than_unit_rounded_half_to_even(self) -> None:
+        """Amounts finer than one cost unit are rounded, not rejected."""
+        assert to_cost_units(Decimal("0.030000000000000002")) == 3 * COST_SCALE // 100
+        assert to_cost_units(Decimal("0.00000000005")) == 0
+        assert to_cost_units(Decimal("0.00000000015")) == 2
+
+    @pytest.mark.parametrize("value", ["NaN", "Infinity", "-Infinity"])
+    def test_non_finite_raises_valueerror(self, value: str) -> None:
+        """Raise ValueError for amounts that are not numbers."""
+        with pytest.raises(ValueError):
+            to_cost_units(Decimal(value))
 
 
 class TestUsageEvent:
@@ -18,17 +50,7 @@ class TestUsageEvent:
         event = make_usage_event()
 
         assert event.user == "alice@example.com"
-        assert event.cost == Decimal("0.05")
-
-    def test_month_key_property(self) -> None:
-        """month_key returns YYYY-MM format."""
-        event = make_usage_event(date=datetime(2026, 3, 15))
-        assert event.month_key == "2026-03"
-
-    def test_month_key_padding(self) -> None:
-        """month_key pads single-digit months with zero."""
-        event = make_usage_event(date=datetime(2026, 1, 5))
-        assert event.month_key == "2026-01"
+        assert event.cost == usd("0.05")
 
     def test_normalized_model_sonnet(self) -> None:
         """normalized_model returns 'sonnet-4-5' for sonnet models."""
@@ -60,16 +82,6 @@ class TestUsageEvent:
         event = make_usage_event(model="Claude-4.5-SONNET")
         assert event.normalized_model == "sonnet-4-5"
 
-    def test_negative_tokens_rejected(self) -> None:
-        """Negative token counts are rejected by validation."""
-        with pytest.raises(ValidationError):
-            make_usage_event(total_tokens=-100)
-
-    def test_negative_cost_rejected(self) -> None:
-        """Negative cost is rejected by validation."""
-        with pytest.raises(ValidationError):
-            make_usage_event(cost="-0.05")
-
 
 class TestModelStats:
     """Tests for ModelStats model."""
@@ -80,18 +92,18 @@ class TestModelStats:
 
         assert stats.input_tokens == 0
         assert stats.output_tokens == 0
-        assert stats.cost == Decimal("0.00")
+        assert stats.cost == 0
 
     def test_create_with_values(self) -> None:
         """Create ModelStats with explicit values."""
         stats = ModelStats(
             input_tokens=1000,
             output_tokens=500,
-            cost=Decimal("0.25"),
+            cost=usd("0.25"),
         )
 
         assert stats.input_tokens == 1000
-        assert stats.cost == Decimal("0.25")
+        assert stats.cost == usd("0.25")
 
 
 class TestUserStats:
@@ -103,7 +115,7 @@ class TestUserStats:
 
         assert stats.input_tokens == 0
         assert stats.total_tokens == 0
-        assert stats.cost == Decimal("0.00")
+        assert stats.cost == 0
 
 
 class TestAggregatedStats:
@@ -115,40 +127,44 @@ class TestAggregatedStats:
 
         assert stats.month == "2026-01"
         assert stats.total_tokens == 0
-        assert stats.cost == Decimal("0.00")
-        assert len(stats.models) == 0
+        assert stats.cost == 0
         assert len(stats.model_stats) == 0
         assert len(stats.user_stats) == 0
 
-    def test_add_single_event(self, single_event: UsageEvent) -> None:
+    def test_add_single_event(
+        self, single_event: UsageEvent, single_event_stats: AggregatedStats
+    ) -> None:
         """Adding event updates all counters."""
-        stats = AggregatedStats(month="2026-01")
-        stats.add(single_event)
+        stats = single_event_stats
 
         assert stats.input_tokens == single_event.input_no_cache
         assert stats.output_tokens == single_event.output_tokens
         assert stats.cost == single_event.cost
-        assert single_event.normalized_model in stats.models
+        assert single_event.normalized_model in stats.model_stats
 
-    def test_add_tracks_model_stats(self, single_event: UsageEvent) -> None:
+    def test_add_tracks_model_stats(
+        self, single_event: UsageEvent, single_event_stats: AggregatedStats
+    ) -> None:
         """Adding event populates model_stats."""
-        stats = AggregatedStats(month="2026-01")
-        stats.add(single_event)
+        stats = single_event_stats
 
         model_name = single_event.normalized_model
         assert model_name in stats.model_stats
         assert stats.model_stats[model_name].cost == single_event.cost
 
-    def test_add_tracks_user_stats(self, single_event: UsageEvent) -> None:
+    def test_add_tracks_user_stats(
+        self, single_event: UsageEvent, single_event_stats: AggregatedStats
+    ) -> None:
         """Adding event populates user_stats."""
-        stats = AggregatedStats(month="2026-01")
-        stats.add(single_event)
+        stats = single_event_stats
 
         user = single_event.user
         assert user in stats.user_stats
         assert stats.user_stats[user].cost == single_event.cost
 
-    def test_add_multiple_events(self, multi_user_events: list[UsageEvent]) -> None:
+    def test_add_multiple_events(
+        self, multi_user_events: tuple[UsageEvent, ...]
+    ) -> None:
         """Adding multiple events accumulates totals."""
         stats = AggregatedStats(month="2026-01")
         for event in multi_user_events:
@@ -157,6 +173,49 @@ class TestAggregatedStats:
         expected_cost = sum(e.cost for e in multi_user_events)
         assert stats.cost == expected_cost
 
+    def test_add_usage_matches_add(self, single_event: UsageEvent) -> None:
+        """add_usage() with an event's values matches add(event)."""
+        from_event = AggregatedStats(month="2026-01").add(single_event)
+        from_values = AggregatedStats(month="2026-01").add_usage(
+            single_event.user,
+            single_event.normalized_model,
+            input_tokens=single_event.input_no_cache,
+            output_tokens=single_event.output_tokens,
+            cache_create=single_event.cache_write,
+            cache_read=single_event.cache_read,
+            total_tokens=single_event.total_tokens,
+            cost=single_event.cost,
+        )
+
+        assert from_values == from_event
+
+    def test_from_counters_matches_add(
+        self, multi_model_events: tuple[UsageEvent, ...]
+    ) -> None:
+        """from_counters() builds the same stats as repeated add()."""
+        expected = AggregatedStats(month="2026-01")
+        for event in multi_model_events:
+            expected.add(event)
+
+        def counters(stats: ModelStats | UserStats | AggregatedStats) -> list[int]:
+            return [
+                stats.input_tokens,
+                stats.output_tokens,
+                stats.cache_create,
+                stats.cache_read,
+                stats.total_tokens,
+                stats.cost,
+            ]
+
+        result = AggregatedStats.from_counters(
+            "2026-01",
+            counters(expected),
+            {m: counters(s) for m, s in expected.model_stats.items()},
+            {u: counters(s) for u, s in expected.user_stats.items()},
+        )
+
+        assert result == expected
+
     def test_add_returns_self(self, single_event: UsageEvent) -> None:
         """add() returns self for method chaining."""
         stats = AggregatedStats(month="2026-01")
@@ -174,10 +233,24 @@ class TestAggregatedStats:
 
         stats1.merge(stats2)
 
-        assert stats1.cost == Decimal("0.30")
+        assert stats1.cost == usd("0.30")
         assert "alice@example.com" in stats1.user_stats
         assert "bob@example.com" in stats1.user_stats
 
+    def test_merge_combines_model_stats(self) -> None:
+        """merge() sums per-model stats across both sides."""
+        stats1 = AggregatedStats(month="2026-01")
+        stats1.add(make_usage_event(model="claude-4.5-sonnet", cost="0.10"))
+
+        stats2 = AggregatedStats(month="2026-01")
+        stats2.add(make_usage_event(model="claude-4.5-sonnet", cost="0.20"))
+        stats2.add(make_usage_event(model="claude-4.5-haiku", cost="0.05"))
+
+        stats1.merge(stats2)
+
+        assert stats1.model_stats["sonnet-4-5"].cost == usd("0.30")
+        assert stats1.model_stats["haiku-4-5"].cost == usd("0.05")
+
     def test_merge_returns_self(self) -> None:
         """merge() returns self for method chaining."""
         stats1 = AggregatedStats(month="2026-01")
@@ -1,14 +1,42 @@
 """Unit tests for cursor_usage.parser module."""
 
-from datetime import datetime
-from decimal import Decimal
 from io import StringIO
 from pathlib import Path
 
 import pytest
 
-from cursor_usage.parser import parse_csv_file, parse_csv_stream, parse_row
-from tests.fixtures.sample_data import make_csv_content, make_csv_row
+from cursor_usage import parser
+from cursor_usage.aggregator import aggregate_by_month
+from cursor_usage.formatter import format_currency
+from cursor_usage.parser import (
+    CSV_COLUMNS,
+    aggregate_csv_file,
+    aggregate_csv_stream,
+    column_indices,
+    parse_csv_file,
+    parse_csv_stream,
+    parse_row,
+)
+from tests.fixtures.sample_data import (
+    BASE_ROW,
+    make_csv_content,
+    make_csv_row,
+    usd,
+)
+
+
+class _LineLimitedStream(StringIO):
+    """StringIO that raises RuntimeError when read past a line limit."""
+
+    def __init__(self, content: str, max_lines: int) -> None:
+        super().__init__(content)
+        self._lines_left = max_lines
+
+    def __next__(self) -> str:
+        if not self._lines_left:
+            raise RuntimeError("read past the line limit")
+        self._lines_left -= 1
+        return super().__next__()
 
 
 class TestParseRow:
@@ -16,71 +44,119 @@ class TestParseRow:
 
     def test_parse_valid_row(self) -> None:
         """Parse a valid CSV row dict into UsageEvent."""
-        row = make_csv_row()
-        event = parse_row(row)
+        event = parse_row(BASE_ROW)
 
         assert event.user == "alice@example.com"
         assert event.model == "claude-4.5-sonnet"
-        assert event.cost == Decimal("0.05")
+        assert event.cost == usd("0.05")
         assert event.total_tokens == 3800
 
     def test_parse_date_with_z_suffix(self) -> None:
         """Handle ISO dates ending with Z (UTC indicator)."""
-        row = make_csv_row(date="2026-01-15T10:30:00.000Z")
+        row = BASE_ROW | {"Date": "2026-01-15T10:30:00.000Z"}
         event = parse_row(row)
-        assert event.date == datetime(2026, 1, 15, 10, 30, 0)
+        assert event.month_key == "2026-01"
 
     def test_parse_date_with_timezone_offset(self) -> None:
         """Handle ISO dates with timezone offset."""
-        row = make_csv_row(date="2026-01-15T10:30:00+02:00")
-        event = parse_row(row)
-        assert event.date == datetime(2026, 1, 15, 10, 30, 0)
-
-    def test_parse_max_mode_yes(self) -> None:
-        """Parse Max Mode = 'Yes' as True."""
-        row = make_csv_row(max_mode="Yes")
+        row = BASE_ROW | {"Date": "2026-01-31T23:30:00+02:00"}
         event = parse_row(row)
-        assert event.max_mode is True
+        assert event.month_key == "2026-01"
 
-    def test_parse_max_mode_no(self) -> None:
-        """Parse Max Mode = 'No' as False."""
-        row = make_csv_row(max_mode="No")
+    def test_parse_date_with_negative_timezone_offset(self) -> None:
+        """Handle ISO dates with a negative timezone offset."""
+        row = BASE_ROW | {"Date": "2026-01-31T23:30:00-05:00"}
         event = parse_row(row)
-        assert event.max_mode is False
+        assert event.month_key == "2026-01"
+
+    @pytest.mark.parametrize(
+        ("date", "month_key"),
+        [
+            ("2026-03-15T10:30:00.000Z", "2026-03"),
+            ("2026-01-05", "2026-01"),
+            ("2026-12-31T23:59:59+14:00", "2026-12"),
+            ("2026-10", "2026-10"),
+        ],
+    )
+    def test_month_key_taken_from_date_prefix(self, date: str, month_key: str) -> None:
+        """month_key is the zero-padded YYYY-MM prefix of the date."""
+        assert parse_row(BASE_ROW | {"Date": date}).month_key == month_key
+
+    @pytest.mark.parametrize(
+        "date",
+        [
+            "15/01/2026",
+            "2026-1-15T10:30:00.000Z",
+            "2026-13-15T10:30:00.000Z",
+            "20x6-01-15",
+            "2026-0",
+        ],
+    )
+    def test_invalid_date_raises_valueerror(self, date: str) -> None:
+        """Raise ValueError for dates not starting with YYYY-MM."""
+        row = BASE_ROW | {"Date": date}
 
-    def test_parse_max_mode_case_insensitive(self) -> None:
-        """Max Mode parsing should be case-insensitive."""
-        row = make_csv_row(max_mode="YES")
-        event = parse_row(row)
-        assert event.max_mode is True
-
-    def test_parse_integer_fields(self) -> None:
-        """Verify all integer fields are parsed correctly."""
-        row = make_csv_row(
-            cache_write="1000",
-            input_no_cache="500",
-            cache_read="2000",
-            output_tokens="300",
-            total_tokens="3800",
-        )
-        event = parse_row(row)
+        with pytest.raises(ValueError):
+            parse_row(row)
 
-        assert event.cache_write == 1000
-        assert event.input_no_cache == 500
-        assert event.cache_read == 2000
-        assert event.output_tokens == 300
-        assert event.total_tokens == 3800
+    @pytest.mark.parametrize(
+        ("raw", "expected"),
+        [("Yes", True), ("No", False), ("YES", True), ("yes", True), ("no", False)],
+    )
+    def test_parse_max_mode(self, raw: str, expected: bool) -> None:
+        """Max Mode 'Yes' parses as True in any case; anything else as False."""
+        event = parse_row(BASE_ROW | {"Max Mode": raw})
+        assert event.max_mode is expected
+
+    @pytest.mark.parametrize(
+        ("column", "field", "value"),
+        [
+            ("Input (w/ Cache Write)", "cache_write", 1001),
+            ("Input (w/o Cache Write)", "input_no_cache", 502),
+            ("Cache Read", "cache_read", 2003),
+            ("Output Tokens", "output_tokens", 304),
+            ("Total Tokens", "total_tokens", 3805),
+        ],
+    )
+    def test_parse_integer_field(self, column: str, field: str, value: int) -> None:
+        """Each integer field is parsed from its own column."""
+        event = parse_row(BASE_ROW | {column: str(value)})
+        assert getattr(event, field) == value
 
     def test_parse_decimal_cost(self) -> None:
-        """Verify cost is parsed as Decimal for precision."""
-        row = make_csv_row(cost="123.45")
+        """Verify cost is parsed exactly into integer cost units."""
+        row = BASE_ROW | {"Cost": "123.45"}
         event = parse_row(row)
-        assert event.cost == Decimal("123.45")
-        assert isinstance(event.cost, Decimal)
+        assert event.cost == 1_234_500_000_000
+
+    def test_parse_cost_keeps_sub_cent_amounts(self) -> None:
+        """Costs finer than a cent are kept exactly."""
+        assert parse_row(BASE_ROW | {"Cost": "0.00005"}).cost == 500_000
+
+    @pytest.mark.parametrize(
+        ("cost", "expected"),
+        [
+            ("0.030000000000000002", 300_000_000),
+            ("1.23456789012345", 12_345_678_901),
+            # Exactly half a unit rounds to the even unit
+            ("0.00000000005", 0),
+            ("0.00000000015", 2),
+        ],
+    )
+    def test_cost_finer_than_unit_rounded(self, cost: str, expected: int) -> None:
+        """Costs finer than one cost unit are rounded half to even."""
+        assert parse_row(BASE_ROW | {"Cost": cost}).cost == expected
+
+    def test_invalid_cost_raises_valueerror(self) -> None:
+        """Raise ValueError for a non-numeric cost."""
+        row = BASE_ROW | {"Cost": "n/a"}
+
+        with pytest.raises(ValueError):
+            parse_row(row)
 
     def test_missing_required_field_raises_keyerror(self) -> None:
         """Raise KeyError when required field is missing."""
-        row = make_csv_row()
+        row = dict(BASE_ROW)
         del row["User"]
 
         with pytest.raises(KeyError):
@@ -88,31 +164,46 @@ class TestParseRow:
 
     def test_invalid_integer_raises_valueerror(self) -> None:
         """Raise ValueError for non-integer token count."""
-        row = make_csv_row(total_tokens="not_a_number")
+        row = BASE_ROW | {"Total Tokens": "not_a_number"}
 
         with pytest.raises(ValueError):
             parse_row(row)
 
 
+class TestColumnIndices:
+    """Tests for column_indices function."""
+
+    def test_export_order(self) -> None:
+        """Header in export order maps to consecutive positions."""
+        assert column_indices(list(CSV_COLUMNS)) == tuple(range(len(CSV_COLUMNS)))
+
+    def test_extra_columns_ignored(self) -> None:
+        """Unknown columns are skipped when resolving positions."""
+        header = ["Extra", *CSV_COLUMNS]
+        assert column_indices(header) == tuple(range(1, len(CSV_COLUMNS) + 1))
+
+    def test_missing_column_raises_keyerror(self) -> None:
+        """Raise KeyError when a required column is absent."""
+        with pytest.raises(KeyError):
+            column_indices([c for c in CSV_COLUMNS if c != "Cost"])
+
+
 class TestParseCsvStream:
     """Tests for parse_csv_stream function."""
 
     def test_parse_valid_stream(self, sample_csv_content: str) -> None:
         """Parse valid CSV stream returns UsageEvents."""
-        stream = StringIO(sample_csv_content)
-        events = list(parse_csv_stream(stream))
+        events = parse_csv_stream(StringIO(sample_csv_content))
 
-        assert len(events) == 2
-        assert events[0].user == "alice@example.com"
-        assert events[1].user == "bob@example.com"
+        assert next(events).user == "alice@example.com"
+        assert next(events).user == "bob@example.com"
+        assert next(events, None) is None
 
     def test_parse_empty_stream(self) -> None:
         """Empty CSV (header only) returns no events."""
-        header_only = "Date,User,Kind,Model,Max Mode,Input (w/ Cache Write),Input (w/o Cache Write),Cache Read,Output Tokens,Total Tokens,Cost\n"
-        stream = StringIO(header_only)
-        events = list(parse_csv_stream(stream))
+        stream = StringIO(",".join(CSV_COLUMNS) + "\n")
 
-        assert len(events) == 0
+        assert next(parse_csv_stream(stream), None) is None
 
     def test_skip_invalid_rows_with_warning(
         self, sample_csv_content: str, capsys: pytest.CaptureFixture[str]
@@ -123,20 +214,261 @@ class TestParseCsvStream:
         stream = StringIO(csv_with_bad_row)
         events = list(parse_csv_stream(stream))
 
+        err = capsys.readouterr().err
         assert len(events) == 2  # Only valid rows
-        captured = capsys.readouterr()
-        assert "Warning" in captured.err
+        assert "Warning" in err
+        assert "row 4" in err
+
+    @pytest.mark.parametrize(
+        "row",
+        [
+            BASE_ROW,
+            BASE_ROW | {"Max Mode": "Yes", "Model": "gpt-5.2", "Cost": "1.2345"},
+        ],
+    )
+    def test_columns_resolved_from_header(self, row: dict[str, str]) -> None:
+        """Columns are matched by header name, not by position.
+
+        The csv.reader list path must give the same event as parse_row()
+        on the equivalent dict.
+        """
+        columns = CSV_COLUMNS[::-1]
+        header = ",".join(columns)
+        values = ",".join(row[name] for name in columns)
+        events = parse_csv_stream(StringIO(f"{header}\n{values}\n"))
+
+        assert next(events) == parse_row(row)
+        assert next(events, None) is None
+
+    def test_missing_column_warns_and_yields_nothing(
+        self, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """A header without a required column yields no events."""
+        stream = StringIO("Date,User\n2026-01-15,alice@example.com\n")
+        events = list(parse_csv_stream(stream))
+
+        assert events == []
+        assert "Missing CSV column" in capsys.readouterr().err
+
+    def test_blank_lines_skipped(self, sample_csv_content: str) -> None:
+        """Blank lines between rows are ignored without warnings."""
+        stream = StringIO(sample_csv_content.replace("\n", "\n\n") + "\n\n")
+        events = list(parse_csv_stream(stream))
+
+        assert len(events) == 2
 
     def test_yields_events_incrementally(self, sample_csv_content: str) -> None:
-        """Verify generator yields events one at a time."""
-        stream = StringIO(sample_csv_content)
-        generator = parse_csv_stream(stream)
+        """The first event is yielded before any later line is read."""
+        # Header and first row only
+        generator = parse_csv_stream(_LineLimitedStream(sample_csv_content, 2))
+
+        assert next(generator).user == "alice@example.com"
+        with pytest.raises(RuntimeError, match="line limit"):
+            next(generator)
+
+
+class TestAggregateCsvStream:
+    """Tests for aggregate_csv_stream function."""
+
+    def test_matches_event_aggregation(self) -> None:
+        """Row-level aggregation matches aggregating parsed events."""
+        csv_content = make_csv_content(
+            [
+                make_csv_row(date="2026-02-01T09:00:00.000Z", cost="0.20"),
+                make_csv_row(
+                    date="2026-01-15T10:30:00.000Z",
+                    user="bob@example.com",
+                    model="claude-4.5-haiku",
+                    cost="0.10",
+                ),
+                make_csv_row(date="2026-01-20T11:00:00.000Z", cost="0.15"),
+            ]
+        )
+
+        result = aggregate_csv_stream(StringIO(csv_content))
+        expected = aggregate_by_month(parse_csv_stream(StringIO(csv_content)))
+
+        assert result == expected
+        assert [s.month for s in result] == ["2026-01", "2026-02"]
+
+    def test_empty_stream(self) -> None:
+        """Empty CSV (header only) returns no months."""
+        stream = StringIO(",".join(CSV_COLUMNS) + "\n")
 
-        first = next(generator)
-        assert first.user == "alice@example.com"
+        assert aggregate_csv_stream(stream) == []
 
-        second = next(generator)
-        assert second.user == "bob@example.com"
+    def test_skip_invalid_rows_with_warning(
+        self, sample_csv_content: str, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Invalid rows are skipped with warning to stderr."""
+        csv_with_bad_row = sample_csv_content + '\n"bad","data","incomplete"\n'
+
+        result = aggregate_csv_stream(StringIO(csv_with_bad_row))
+
+        assert len(result) == 1
+        assert len(result[0].user_stats) == 2
+        assert "Skipping row 4" in capsys.readouterr().err
+
+    def test_rows_with_finer_costs_kept(self) -> None:
+        """Rows with costs finer than one unit are aggregated, not skipped."""
+        csv_content = make_csv_content(
+            [
+                make_csv_row(cost="0.030000000000000002"),
+                make_csv_row(cost="1.23456789012345"),
+                make_csv_row(cost="0.05"),
+            ]
+        )
+
+        (result,) = aggregate_csv_stream(StringIO(csv_content))
+
+        assert result.total_tokens == 3 * 3800
+        assert format_currency(result.cost) == "$1.31"
+
+    def test_sums_sub_cent_costs_exactly(self) -> None:
+        """Many sub-cent costs add up without per-row rounding."""
+        csv_content = make_csv_content([make_csv_row(cost="0.00005")] * 200)
+
+        (result,) = aggregate_csv_stream(StringIO(csv_content))
+
+        assert result.cost == usd("0.01")
+        assert format_currency(result.cost) == "$0.01"
+
+
+class TestAggregateCsvFile:
+    """Tests for aggregate_csv_file function."""
+
+    def test_small_file(self, temp_csv_file: Path) -> None:
+        """Small files are aggregated by the row-by-row parser."""
+        result = aggregate_csv_file(temp_csv_file)
+
+        assert len(result) == 1
+        assert len(result[0].user_stats) == 2
+
+    def test_large_file_matches_small_file(
+        self, temp_csv_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Files over the pyarrow threshold give the same result."""
+        expected = aggregate_csv_file(temp_csv_file)
+        monkeypatch.setattr(parser, "ARROW_MIN_FILE_SIZE", 0)
+
+        assert aggregate_csv_file(temp_csv_file) == expected
+
+    def test_large_file_with_bad_row_warns(
+        self,
+        tmp_path: Path,
+        sample_csv_content: str,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Malformed large files still skip bad rows with a warning."""
+        csv_file = tmp_path / "bad.csv"
+        csv_file.write_text(sample_csv_content + "\n" + ",".join(["x"] * 11) + "\n")
+        monkeypatch.setattr(parser, "ARROW_MIN_FILE_SIZE", 0)
+
+        result = aggregate_csv_file(csv_file)
+
+        assert len(result[0].user_stats) == 2
+        assert "Warning" in capsys.readouterr().err
+
+    @pytest.mark.parametrize(
+        "thresholds",
+        [
+            pytest.param({}, id="serial"),
+            pytest.param({"ARROW_MIN_FILE_SIZE": 0}, id="arrow"),
+            pytest.param(
+                {"PARALLEL_MIN_FILE_SIZE": 1}, id="parallel", marks=pytest.mark.slow
+            ),
+        ],
+    )
+    def test_byte_order_mark_ignored(
+        self,
+        tmp_path: Path,
+        sample_csv_content: str,
+        thresholds: dict[str, int],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Every path reads a file with a UTF-8 BOM like one without."""
+        csv_file = tmp_path / "bom.csv"
+        csv_file.write_text("\ufeff" + sample_csv_content, encoding="utf-8")
+        expected = aggregate_csv_stream(StringIO(sample_csv_content))
+        for name, value in thresholds.items():
+            monkeypatch.setattr(parser, name, value)
+        monkeypatch.setattr(parser, "_available_cpus", lambda: 2)
+
+        assert aggregate_csv_file(csv_file) == expected
+
+    def test_large_file_missing_column_warns(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Files over the pyarrow threshold still require every column."""
+        columns = [name for name in CSV_COLUMNS if name != "Kind"]
+        csv_file = tmp_path / "no_kind.csv"
+        csv_file.write_text(
+            ",".join(columns) + "\n" + ",".join(BASE_ROW[c] for c in columns) + "\n"
+        )
+        monkeypatch.setattr(parser, "ARROW_MIN_FILE_SIZE", 0)
+
+        assert aggregate_csv_file(csv_file) == []
+        assert "Missing CSV column 'Kind'" in capsys.readouterr().err
+
+    @pytest.mark.slow
+    def test_parallel_matches_serial(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Splitting a file across workers gives the serial result and warnings."""
+        rows = [
+            make_csv_row(
+                date=f"2026-{month:02d}-15T10:30:00.000Z",
+                user=f"user{i % 4}@example.com",
+                kind="Included\nwith newline" if i % 2 else "Included",
+                cost=f"0.{i:04d}",
+            )
+            for i, month in enumerate([1, 2, 3] * 20)
+        ]
+        rows[7]["Cost"] = "bad"
+        rows[41]["Date"] = "bad"
+        csv_file = tmp_path / "usage.csv"
+        csv_file.write_text(make_csv_content(rows) + "\n")
+        expected = aggregate_csv_file(csv_file)
+        expected_err = capsys.readouterr().err
+        monkeypatch.setattr(parser, "PARALLEL_MIN_FILE_SIZE", 1)
+        monkeypatch.setattr(parser, "_available_cpus", lambda: 7)
+        # Count quotes across many windows between boundaries
+        monkeypatch.setattr(parser, "_QUOTE_SCAN_WINDOW", 7)
+
+        result = aggregate_csv_file(csv_file)
+
+        assert result == expected
+        assert capsys.readouterr().err == expected_err
+        assert "Skipping row 9:" in expected_err
+        assert "Skipping row 43:" in expected_err
+
+    def test_workers_capped_by_file_size(
+        self, temp_csv_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A file worth only one worker is not split, however many CPUs."""
+        expected = aggregate_csv_file(temp_csv_file)
+        size = temp_csv_file.stat().st_size
+        monkeypatch.setattr(parser, "PARALLEL_MIN_FILE_SIZE", size // 2 + 1)
+        monkeypatch.setattr(parser, "_available_cpus", lambda: 64)
+
+        def fail(file_path: Path, workers: int) -> None:
+            pytest.fail(f"{file_path.name} was split across {workers} workers")
+
+        monkeypatch.setattr(parser, "_aggregate_csv_file_parallel", fail)
+
+        assert aggregate_csv_file(temp_csv_file) == expected
+
+    def test_file_not_found(self, tmp_path: Path) -> None:
+        """Raise FileNotFoundError for missing file."""
+        with pytest.raises(FileNotFoundError):
+            aggregate_csv_file(tmp_path / "nonexistent.csv")
 
 
 class TestParseCsvFile:
@@ -168,7 +500,7 @@ class TestCsvQuotedFields:
             ]
         )
         stream = StringIO(csv_content)
-        events = list(parse_csv_stream(stream))
+        events = parse_csv_stream(stream)
 
-        assert len(events) == 1
-        assert events[0].model == "model, with comma"
+        assert next(events).model == "model, with comma"
+        assert next(events, None) is None
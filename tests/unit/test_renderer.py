@@ -1,12 +1,18 @@
 """Unit tests for cursor_usage.renderer module."""
 
+import re
+from collections.abc import Iterable
 from datetime import datetime
 
+import pytest
+
 from cursor_usage.aggregator import aggregate_by_month, compute_grand_total
+from cursor_usage.models import AggregatedStats, UsageEvent
 from cursor_usage.renderer import (
     COLUMNS_GROUP_BY_USER,
     COLUMNS_NO_BREAKDOWN,
     COLUMNS_WITH_BREAKDOWN,
+    Column,
     anonymize_email,
     get_columns,
     render_border,
@@ -16,56 +22,99 @@ from cursor_usage.renderer import (
 )
 from tests.fixtures.sample_data import make_usage_event
 
+Aggregation = tuple[list[AggregatedStats], AggregatedStats]
 
-class TestAnonymizeEmail:
-    """Tests for anonymize_email function."""
+# Full-line shapes of rendered rules: corner, runs of ─ split by junctions, corner
+TOP_BORDER_RE = re.compile(r"┌(?:─+┬)+─+┐")
+BOTTOM_BORDER_RE = re.compile(r"└(?:─+┴)+─+┘")
+SEPARATOR_RE = re.compile(r"├(?:─+┼)+─+┤")
 
-    def test_returns_user_hash_format(self) -> None:
-        """Returns User-{hash} format."""
-        result = anonymize_email("test@example.com")
+# Anonymized user identifier: "User-" + 8 hex chars of the digest
+ANONYMIZED_RE = re.compile(r"User-[0-9a-f]{8}")
 
-        assert result.startswith("User-")
-        assert len(result) == 13  # "User-" + 8 hex chars
+# Content of the default table, in render order: month row before the total row,
+# and the input token column before the cost column within a row
+MONTH_THEN_TOTAL_RE = re.compile(r"2026-01.*?Total", re.S)
+INPUT_THEN_COST_RE = re.compile(r"1,000.*?\$0\.25")
 
-    def test_consistent_hashing(self) -> None:
-        """Same email produces same hash."""
-        email = "alice@example.com"
 
-        hash1 = anonymize_email(email)
-        hash2 = anonymize_email(email)
+@pytest.fixture(scope="module")
+def default_aggregation() -> Aggregation:
+    """Monthly stats and grand total for one sonnet event in 2026-01."""
+    monthly = aggregate_by_month([make_usage_event(input_no_cache=1000, cost="0.25")])
+    return monthly, compute_grand_total(monthly)
 
-        assert hash1 == hash2
 
-    def test_different_emails_different_hashes(self) -> None:
-        """Different emails produce different hashes."""
-        hash1 = anonymize_email("alice@example.com")
-        hash2 = anonymize_email("bob@example.com")
+def _render(events: Iterable[UsageEvent], **options: bool) -> str:
+    """Aggregate events by month and render them with their grand total."""
+    monthly = aggregate_by_month(events)
+    return render_table(monthly, compute_grand_total(monthly), **options)
 
-        assert hash1 != hash2
 
+def _breakdown_lines(table: str) -> list[str]:
+    """Return the per-model or per-user breakdown rows of a rendered table."""
+    return [line for line in table.split("\n") if "└─ " in line]
 
-class TestGetColumns:
-    """Tests for get_columns function."""
 
-    def test_default_columns(self) -> None:
-        """Default (no flags) uses COLUMNS_NO_BREAKDOWN."""
-        result = get_columns(show_models=False, group_by_user=False)
-        assert result == COLUMNS_NO_BREAKDOWN
+@pytest.fixture(scope="module")
+def user_breakdown_lines() -> list[str]:
+    """User breakdown rows for three users with different costs."""
+    events = [
+        make_usage_event(user="low-spender@example.com", cost="0.05"),
+        make_usage_event(user="high-spender@example.com", cost="0.50"),
+        make_usage_event(user="mid-spender@example.com", cost="0.25"),
+    ]
+    return _breakdown_lines(_render(events, group_by_user=True))
+
+
+@pytest.fixture(scope="module")
+def model_breakdown_lines() -> list[str]:
+    """Model breakdown rows for three models with different costs."""
+    events = [
+        make_usage_event(model="claude-4.5-haiku", cost="0.05"),
+        make_usage_event(model="claude-4.5-opus", cost="0.50"),
+        make_usage_event(model="claude-4.5-sonnet", cost="0.25"),
+    ]
+    return _breakdown_lines(_render(events, show_models=True))
+
+
+class TestAnonymizeEmail:
+    """Tests for anonymize_email function."""
+
+    def test_anonymize_properties(self) -> None:
+        """Identifiers are well-formed, distinct per email and deterministic."""
+        emails = ["alice@example.com", "bob@example.com", "carol@example.com"]
+
+        hashes = [anonymize_email(email) for email in emails]
+
+        assert all(ANONYMIZED_RE.fullmatch(h) for h in hashes)
+        assert len(set(hashes)) == len(emails)
+        # The memoized result matches a fresh computation
+        assert anonymize_email.__wrapped__(emails[0]) == hashes[0]
 
-    def test_breakdown_columns(self) -> None:
-        """show_models=True uses COLUMNS_WITH_BREAKDOWN."""
-        result = get_columns(show_models=True, group_by_user=False)
-        assert result == COLUMNS_WITH_BREAKDOWN
+    def test_known_digest(self) -> None:
+        """Identifier is the 4-byte BLAKE2b digest of the email."""
+        assert anonymize_email("alice@example.com") == "User-1e5ced43"
 
-    def test_user_group_columns(self) -> None:
-        """group_by_user=True uses COLUMNS_GROUP_BY_USER."""
-        result = get_columns(show_models=False, group_by_user=True)
-        assert result == COLUMNS_GROUP_BY_USER
 
-    def test_group_by_user_takes_precedence(self) -> None:
-        """group_by_user takes precedence over show_models."""
-        result = get_columns(show_models=True, group_by_user=True)
-        assert result == COLUMNS_GROUP_BY_USER
+class TestGetColumns:
+    """Tests for get_columns function."""
+
+    @pytest.mark.parametrize(
+        ("show_models", "group_by_user", "expected"),
+        [
+            (False, False, COLUMNS_NO_BREAKDOWN),
+            (True, False, COLUMNS_WITH_BREAKDOWN),
+            (False, True, COLUMNS_GROUP_BY_USER),
+            # group_by_user takes precedence over show_models
+            (True, True, COLUMNS_GROUP_BY_USER),
+        ],
+    )
+    def test_get_columns(
+        self, show_models: bool, group_by_user: bool, expected: tuple[Column, ...]
+    ) -> None:
+        """Each flag combination returns its shared column set."""
+        assert get_columns(show_models, group_by_user) is expected
 
 
 class TestRenderBorder:
@@ -75,18 +124,13 @@ class TestRenderBorder:
         """Top border uses correct box-drawing characters."""
         result = render_border("top", COLUMNS_NO_BREAKDOWN)
 
-        assert result.startswith("┌")
-        assert result.endswith("┐")
-        assert "┬" in result
-        assert "─" in result
+        assert TOP_BORDER_RE.fullmatch(result)
 
     def test_bottom_border_chars(self) -> None:
         """Bottom border uses correct box-drawing characters."""
         result = render_border("bottom", COLUMNS_NO_BREAKDOWN)
 
-        assert result.startswith("└")
-        assert result.endswith("┘")
-        assert "┴" in result
+        assert BOTTOM_BORDER_RE.fullmatch(result)
 
 
 class TestRenderSeparator:
@@ -96,9 +140,14 @@ class TestRenderSeparator:
         """Separator uses correct box-drawing characters."""
         result = render_separator(COLUMNS_NO_BREAKDOWN)
 
-        assert result.startswith("├")
-        assert result.endswith("┤")
-        assert "┼" in result
+        assert SEPARATOR_RE.fullmatch(result)
+
+    def test_separator_cached_per_column_set(self) -> None:
+        """Repeated calls for the same column set reuse one string."""
+        first = render_separator(COLUMNS_WITH_BREAKDOWN)
+
+        assert render_separator(COLUMNS_WITH_BREAKDOWN) is first
+        assert render_separator(COLUMNS_NO_BREAKDOWN) != first
 
 
 class TestRenderHeader:
@@ -117,83 +166,71 @@ class TestRenderHeader:
 class TestRenderTable:
     """Tests for render_table function."""
 
-    def test_renders_complete_table(self) -> None:
+    def test_renders_complete_table(self, default_aggregation: Aggregation) -> None:
         """render_table produces complete table structure."""
-        events = [
-            make_usage_event(
-                date=datetime(2026, 1, 15),
-                model="claude-4.5-sonnet",
-                cost="0.25",
-                input_no_cache=1000,
-                output_tokens=500,
-            )
-        ]
-        monthly = aggregate_by_month(events)
-        total = compute_grand_total(monthly)
-
-        result = render_table(monthly, total)
+        result = render_table(*default_aggregation)
 
         # Check structure
         lines = result.split("\n")
-        assert lines[0].startswith("┌")  # Top border
-        assert lines[-1].startswith("└")  # Bottom border
+        assert TOP_BORDER_RE.fullmatch(lines[0])
+        assert BOTTOM_BORDER_RE.fullmatch(lines[-1])
 
         # Check content
-        assert "2026-01" in result
-        assert "Total" in result
+        assert MONTH_THEN_TOTAL_RE.search(result)
 
-    def test_table_contains_formatted_numbers(self) -> None:
+    def test_table_contains_formatted_numbers(
+        self, default_aggregation: Aggregation
+    ) -> None:
         """Numbers are formatted with commas."""
-        events = [
-            make_usage_event(
-                input_no_cache=1000,
-                cost="0.25",
-            )
-        ]
-        monthly = aggregate_by_month(events)
-        total = compute_grand_total(monthly)
-
-        result = render_table(monthly, total)
-
-        assert "1,000" in result  # Input tokens
-        assert "$0.25" in result  # Cost
-
-    def test_show_models_breakdown(self) -> None:
-        """show_models=True includes per-model rows."""
-        events = [
-            make_usage_event(model="claude-4.5-sonnet", cost="0.10"),
-            make_usage_event(model="claude-4.5-haiku", cost="0.05"),
-        ]
-        monthly = aggregate_by_month(events)
-        total = compute_grand_total(monthly)
-
-        result = render_table(monthly, total, show_models=True)
-
-        assert "sonnet-4-5" in result
-        assert "haiku-4-5" in result
-        assert "└─" in result  # Breakdown row indicator
-
-    def test_group_by_user(self) -> None:
-        """group_by_user=True shows per-user breakdown."""
-        events = [
-            make_usage_event(user="alice@example.com", cost="0.10"),
-            make_usage_event(user="bob@example.com", cost="0.20"),
-        ]
-        monthly = aggregate_by_month(events)
-        total = compute_grand_total(monthly)
-
-        result = render_table(monthly, total, group_by_user=True)
-
-        assert "alice@example.com" in result
-        assert "bob@example.com" in result
-
-    def test_group_by_user_no_models_column(self) -> None:
+        result = render_table(*default_aggregation)
+
+        assert INPUT_THEN_COST_RE.search(result)
+
+    @pytest.mark.parametrize(
+        ("events", "options", "expected"),
+        [
+            pytest.param(
+                [
+                    make_usage_event(model="claude-4.5-sonnet", cost="0.10"),
+                    make_usage_event(model="claude-4.5-haiku", cost="0.05"),
+                ],
+                {"show_models": True},
+                ["sonnet-4-5", "haiku-4-5", "└─ "],
+                id="model-breakdown",
+            ),
+            pytest.param(
+                [
+                    make_usage_event(user="alice@example.com", cost="0.10"),
+                    make_usage_event(user="bob@example.com", cost="0.20"),
+                ],
+                {"group_by_user": True},
+                ["alice@example.com", "bob@example.com"],
+                id="user-breakdown",
+            ),
+            pytest.param(
+                [
+                    make_usage_event(date=datetime(2026, 1, 10), cost="0.10"),
+                    make_usage_event(date=datetime(2026, 2, 10), cost="0.20"),
+                ],
+                {},
+                ["2026-01", "2026-02", "Total"],
+                id="multiple-months",
+            ),
+        ],
+    )
+    def test_renders_expected_labels(
+        self, events: list[UsageEvent], options: dict[str, bool], expected: list[str]
+    ) -> None:
+        """Each scenario renders once and contains all of its row labels."""
+        result = _render(events, **options)
+
+        assert [label for label in expected if label not in result] == []
+
+    def test_group_by_user_no_models_column(
+        self, default_aggregation: Aggregation
+    ) -> None:
         """group_by_user=True excludes Models column."""
-        events = [make_usage_event()]
-        monthly = aggregate_by_month(events)
-        total = compute_grand_total(monthly)
-
-        result = render_table(monthly, total, group_by_user=True)
+        result = render_table(*default_aggregation, group_by_user=True)
         header_line = result.split("\n")[1]
 
         assert "Models" not in header_line
@@ -204,68 +241,27 @@ class TestRenderTable:
             make_usage_event(user="alice@example.com"),
             make_usage_event(user="bob@example.com"),
         ]
-        monthly = aggregate_by_month(events)
-        total = compute_grand_total(monthly)
 
-        result = render_table(monthly, total, group_by_user=True, anonymize=True)
+        result = _render(events, group_by_user=True, anonymize=True)
 
         assert "alice@example.com" not in result
         assert "bob@example.com" not in result
         assert "User-" in result
 
-    def test_users_sorted_by_cost_descending(self) -> None:
+    def test_users_sorted_by_cost_descending(
+        self, user_breakdown_lines: list[str]
+    ) -> None:
         """Users in breakdown are sorted by cost (highest first)."""
-        events = [
-            make_usage_event(user="low-spender@example.com", cost="0.05"),
-            make_usage_event(user="high-spender@example.com", cost="0.50"),
-            make_usage_event(user="mid-spender@example.com", cost="0.25"),
-        ]
-        monthly = aggregate_by_month(events)
-        total = compute_grand_total(monthly)
-
-        result = render_table(monthly, total, group_by_user=True)
-        lines = result.split("\n")
-
-        # Find user lines and verify order
-        user_lines = [line for line in lines if "└─" in line and "@" in line]
-        assert "high-spender" in user_lines[0]
-        assert "low-spender" in user_lines[-1]
-
-    def test_models_sorted_by_cost_descending(self) -> None:
+        assert len(user_breakdown_lines) == 3
+        assert "high-spender" in user_breakdown_lines[0]
+        assert "mid-spender" in user_breakdown_lines[1]
+        assert "low-spender" in user_breakdown_lines[2]
+
+    def test_models_sorted_by_cost_descending(
+        self, model_breakdown_lines: list[str]
+    ) -> None:
         """Models in breakdown are sorted by cost (highest first)."""
-        events = [
-            make_usage_event(model="claude-4.5-haiku", cost="0.05"),
-            make_usage_event(model="claude-4.5-opus", cost="0.50"),
-            make_usage_event(model="claude-4.5-sonnet", cost="0.25"),
-        ]
-        monthly = aggregate_by_month(events)
-        total = compute_grand_total(monthly)
-
-        result = render_table(monthly, total, show_models=True)
-        lines = result.split("\n")
-
-        # Find model breakdown lines (contain "└─" and a model name)
-        model_lines = [
-            line
-            for line in lines
-            if "└─" in line and any(m in line for m in ["opus", "sonnet", "haiku"])
-        ]
-        assert len(model_lines) == 3
-        assert "opus" in model_lines[0]
-        assert "sonnet" in model_lines[1]
-        assert "haiku" in model_lines[2]
-
-    def test_multiple_months(self) -> None:
-        """Render table with multiple months."""
-        events = [
-            make_usage_event(date=datetime(2026, 1, 10), cost="0.10"),
-            make_usage_event(date=datetime(2026, 2, 10), cost="0.20"),
-        ]
-        monthly = aggregate_by_month(events)
-        total = compute_grand_total(monthly)
-
-        result = render_table(monthly, total)
-
-        assert "2026-01" in result
-        assert "2026-02" in result
-        assert "Total" in result
+        assert len(model_breakdown_lines) == 3
+        assert "opus" in model_breakdown_lines[0]
+        assert "sonnet" in model_breakdown_lines[1]
+        assert "haiku" in model_breakdown_lines[2]